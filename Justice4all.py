@@ -1,4 +1,4 @@
-import sys, requests
+import sys
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -6,8 +6,8 @@ from PyQt5.QtWidgets import (
     QWidget,
     QLineEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QAbstractItemView,
     QComboBox,
     QLabel,
     QMenuBar,
@@ -20,45 +20,283 @@ from PyQt5.QtWidgets import (
     QSpacerItem,
     QSizePolicy,
     QGraphicsOpacityEffect,
+    QListWidget,
+    QPlainTextEdit,
+    QStyle,
+    QStyleOptionButton,
+    QStylePainter,
 )
 from PyQt5.QtCore import (
     Qt,
+    QAbstractTableModel,
+    QModelIndex,
     QUrl,
     QTimer,
     QPropertyAnimation,
     QEasingCurve,
     QVariantAnimation,
     QEvent,
+    QThread,
+    QSettings,
+    QAbstractAnimation,
+    pyqtSignal,
 )
 from PyQt5.QtGui import QDesktopServices, QFont, QColor, QPalette, QLinearGradient
-from bs4 import BeautifulSoup
-import warnings, re, os, json, csv, datetime, subprocess, platform
-from io import StringIO
+from justice4all_core import (
+    RecordStore,
+    Watchlist,
+    DataLoader,
+    SourceNotModified,
+    LoadCancelled,
+    BatchMatcher,
+    parse_file,
+    iter_batch_queries,
+    write_batch_report,
+    export_to_path,
+    export_diff_to_path,
+    SEARCH_CRITERIA_FIELDS,
+    FUZZY_CRITERIA,
+    RANKED_CRITERIA,
+    SCORED_CRITERIA,
+    QuerySyntaxError,
+    CSV_URL,
+    RSS_URL,
+)
+import re, os, datetime, multiprocessing
+from collections import OrderedDict
 
-warnings.filterwarnings(
-    "ignore", category=requests.packages.urllib3.exceptions.InsecureRequestWarning
+SEARCH_DEBOUNCE_MS = 250
+DETAIL_CACHE_SIZE = 256
+RAINBOW_INTERVAL_MS = 30
+RAINBOW_HOVER_INTERVAL_MS = 10
+LOW_POWER_SETTING = "animations/low_power"
+DETAIL_FIELDS = [
+    ("id", "№"),
+    ("material_title", "Название материала"),
+    ("author_or_publisher", "Автор/Издатель"),
+    ("original_description", "Полное описание"),
+    ("category", "Категория"),
+    ("court_name", "Суд"),
+    ("decision_date", "Дата решения"),
+    ("entry_date", "Дата включения в список"),
+    ("links", "Ссылки"),
+]
+URL_PATTERN = re.compile(
+    '(?<!href=")(?P<url>(?:https?|ftp|sftp)://[^\\s/$.?#].[^\\s]*)'
 )
-DATA_FILE_PATH = "extremist_materials_data.json"
-CSV_URL = "https://minjust.gov.ru/uploaded/files/exportfsm.csv"
-RSS_URL = "https://minjust.gov.ru/ru/subscription/rss/extremist_materials/"
-ENCODINGS_TO_TRY = ["utf-8", "windows-1251", "cp1251", "latin-1", "cp866"]
+SORT_COLUMNS = {
+    0: "id",
+    1: "author_or_publisher",
+    2: "material_title",
+    4: "decision_date",
+    5: "entry_date",
+}
+
+
+class DataLoadWorker(QThread):
+    progress = pyqtSignal(str)
+    stage = pyqtSignal(str)
+    records_parsed = pyqtSignal(str, int)
+    loaded = pyqtSignal(object, object, object, object, str)
+    merged = pyqtSignal(object, object)
+    unchanged = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, app, delta_from=None):
+        super().__init__(app)
+        self.loader = DataLoader(
+            app.store,
+            delta_from=delta_from,
+            progress=self.progress.emit,
+            stage=self.stage.emit,
+            records_parsed=self.records_parsed.emit,
+        )
+
+    def cancel(self):
+        self.loader.cancel()
+
+    def commit_http_cache(self):
+        self.loader.commit_http_cache()
+
+    def run(self):
+        try:
+            result = self.loader.load()
+        except SourceNotModified:
+            self.unchanged.emit(self.loader.current_stage)
+        except LoadCancelled:
+            self.failed.emit("Обновление данных отменено.")
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            if result.kind == "merged":
+                self.merged.emit(result.data, result.index)
+            else:
+                self.loaded.emit(
+                    result.data,
+                    result.index,
+                    result.search_index,
+                    result.categories,
+                    result.message,
+                )
+
+
+class ExportWorker(QThread):
+    progress = pyqtSignal(int, int)
+    exported = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, app, file_path, records, rows):
+        super().__init__(app)
+        self.file_path = file_path
+        self.records = records
+        self.rows = rows
+
+    def run(self):
+        try:
+            export_to_path(self.file_path, self.records, self.rows, self.progress.emit)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.exported.emit(self.file_path)
+
+
+class RainbowButton(QPushButton):
+    def __init__(self, text, parent=None):
+        super().__init__(text, parent)
+        self.text_color = None
+
+    def set_text_color(self, color):
+        self.text_color = color
+        self.update()
+
+    def paintEvent(self, event):
+        if self.text_color is None:
+            super().paintEvent(event)
+            return
+        option = QStyleOptionButton()
+        self.initStyleOption(option)
+        (text, option.text) = (option.text, "")
+        painter = QStylePainter(self)
+        painter.drawControl(QStyle.CE_PushButton, option)
+        painter.setPen(self.text_color)
+        painter.drawText(
+            self.style().subElementRect(QStyle.SE_PushButtonContents, option, self),
+            Qt.AlignCenter,
+            text,
+        )
+
+
+class MaterialsTableModel(QAbstractTableModel):
+    COLUMNS = [
+        ("id", "№", "N/A"),
+        ("author_or_publisher", "Автор", "Неизвестен"),
+        ("material_title", "Название материала", "Не указано"),
+        ("description", "Описание", "Отсутствует"),
+        ("decision_date", "Дата решения", "Неизвестна"),
+        ("entry_date", "Дата включения", "Неизвестна"),
+    ]
+
+    SCORE_HEADER = "Сходство"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+        self.rows = []
+        self.scores = {}
+
+    def set_rows(self, records, rows, scores=None):
+        self.beginResetModel()
+        self.records = records
+        self.rows = rows
+        self.scores = scores or {}
+        self.endResetModel()
+
+    def record(self, row):
+        return self.records[self.rows[row]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS) + (1 if self.scores else 0)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.column() == len(self.COLUMNS):
+            if role == Qt.DisplayRole:
+                return f"{self.scores.get(self.rows[index.row()], 0):.0%}"
+            return None
+        (key, _, default) = self.COLUMNS[index.column()]
+        if role == Qt.DisplayRole:
+            return str(self.record(index.row()).get(key, default))
+        if role == Qt.ToolTipRole and key == "description":
+            item = self.record(index.row())
+            return item.get("original_description", item.get(key, default))
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            if section == len(self.COLUMNS):
+                return self.SCORE_HEADER
+            return self.COLUMNS[section][1]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+
+def render_material_details(material_data):
+    html_content = []
+    html_content.append(
+        "<h2 style='color: #d17a3a; text-align: center;'>Подробности о материале</h2>"
+    )
+    for (key, display_name) in DETAIL_FIELDS:
+        value = material_data.get(key, "Не указано")
+        if key == "original_description":
+            description_html = URL_PATTERN.sub(
+                '<a href="\\g<url>" style="color: #e08b47;">\\g<url></a>', value
+            )
+            html_content.append(
+                f"<p><strong><span style='color: #a0a0a0;'>{display_name}:</span></strong> {description_html}</p>"
+            )
+        elif key == "links":
+            if isinstance(value, list) and value:
+                link_html = "<ul style='margin-left: 15px;'>"
+                for link in value:
+                    if link:
+                        link_html += f"<li><a href='{link}' style='color: #e08b47;'>{link}</a></li>"
+                link_html += "</ul>"
+                html_content.append(
+                    f"<p><strong><span style='color: #a0a0a0;'>{display_name}:</span></strong></p>{link_html}"
+                )
+            else:
+                html_content.append(
+                    f"<p><strong><span style='color: #a0a0a0;'>{display_name}:</span></strong> Не указано</p>"
+                )
+        else:
+            html_content.append(
+                f"<p><strong><span style='color: #a0a0a0;'>{display_name}:</span></strong> {value}</p>"
+            )
+    return "\n".join(html_content)
 
 
 class MaterialDetailDialog(QDialog):
-    def __init__(self, parent, material_data):
+    navigated = pyqtSignal(int)
+
+    def __init__(self, parent):
         super().__init__(parent)
-        self.setWindowTitle(
-            f"Подробная информация о материале № {material_data.get('id','N/A')}"
-        )
         self.setGeometry(parent.x() + 50, parent.y() + 50, 800, 600)
         self.setMinimumSize(1000, 600)
-        self.setModal(True)
+        self.setModal(False)
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
-        self.material_data = material_data
         self.setStyleSheet(parent.get_dark_theme_stylesheet())
-        self.setFocus()
+        self.rendered = OrderedDict()
         self.init_ui()
-        self.display_material_details()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -67,6 +305,7 @@ class MaterialDetailDialog(QDialog):
             "background-color: #3c3c3c; color: #e0e0e0; border: 1px solid #505050; padding: 15px; border-radius: 5px;"
         )
         self.detail_text_browser.setOpenExternalLinks(True)
+        self.detail_text_browser.setFocusPolicy(Qt.NoFocus)
         layout.addWidget(self.detail_text_browser)
         disclaimer_label = QLabel(
             "<i style='color: #d17a3a;'>Если что-то пропарсилось неправильно - не моя вина, а вина тех, кто заполняет не стандартизированно и с неправильным синтаксисом/неграмотно</i>"
@@ -74,70 +313,48 @@ class MaterialDetailDialog(QDialog):
         disclaimer_label.setWordWrap(True)
         disclaimer_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(disclaimer_label)
+        navigation_label = QLabel(
+            "<i style='color: #a0a0a0;'>↑/↓ — предыдущая/следующая запись, Esc — закрыть</i>"
+        )
+        navigation_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(navigation_label)
         close_button = QPushButton("Закрыть")
         close_button.setStyleSheet(
             "\n            QPushButton { \n                background-color: #d17a3a; \n                color: #ffffff; \n                border: none; \n                border-radius: 5px; \n                padding: 10px 15px; \n                font-weight: bold; \n            }\n            QPushButton:hover { \n                background-color: #e08b3a; \n            }\n        "
         )
+        close_button.setFocusPolicy(Qt.NoFocus)
         close_button.clicked.connect(self.force_close)
         layout.addWidget(close_button, alignment=Qt.AlignCenter)
 
     def force_close(self):
         self.done(QDialog.Accepted)
 
-    def display_material_details(self):
-        html_content = []
-        html_content.append(
-            "<h2 style='color: #d17a3a; text-align: center;'>Подробности о материале</h2>"
-        )
-        fields_order = [
-            ("id", "№"),
-            ("material_title", "Название материала"),
-            ("author_or_publisher", "Автор/Издатель"),
-            ("original_description", "Полное описание"),
-            ("category", "Категория"),
-            ("court_name", "Суд"),
-            ("decision_date", "Дата решения"),
-            ("entry_date", "Дата включения в список"),
-            ("links", "Ссылки"),
-        ]
-        for (key, display_name) in fields_order:
-            value = self.material_data.get(key, "Не указано")
-            if key == "original_description":
-                description_html = value
-                url_pattern = (
-                    '(?<!href=")(?P<url>(?:https?|ftp|sftp)://[^\\s/$.?#].[^\\s]*)'
-                )
-                description_html = re.sub(
-                    url_pattern,
-                    '<a href="\\g<url>" style="color: #e08b47;">\\g<url></a>',
-                    description_html,
-                )
-                html_content.append(
-                    f"<p><strong><span style='color: #a0a0a0;'>{display_name}:</span></strong> {description_html}</p>"
-                )
-            elif key == "links":
-                if isinstance(value, list) and value:
-                    link_html = "<ul style='margin-left: 15px;'>"
-                    for link in value:
-                        if link:
-                            link_html += f"<li><a href='{link}' style='color: #e08b47;'>{link}</a></li>"
-                    link_html += "</ul>"
-                    html_content.append(
-                        f"<p><strong><span style='color: #a0a0a0;'>{display_name}:</span></strong></p>{link_html}"
-                    )
-                else:
-                    html_content.append(
-                        f"<p><strong><span style='color: #a0a0a0;'>{display_name}:</span></strong> Не указано</p>"
-                    )
-            else:
-                html_content.append(
-                    f"<p><strong><span style='color: #a0a0a0;'>{display_name}:</span></strong> {value}</p>"
-                )
-        self.detail_text_browser.setHtml("\n".join(html_content))
+    def show_material(self, key, material_data):
+        html_content = self.rendered.get(key)
+        if html_content is None:
+            html_content = render_material_details(material_data)
+            self.rendered[key] = html_content
+            if len(self.rendered) > DETAIL_CACHE_SIZE:
+                self.rendered.popitem(last=False)
+        else:
+            self.rendered.move_to_end(key)
+        self.setWindowTitle(f"Подробная информация о материале № {key[0]}")
+        self.detail_text_browser.setHtml(html_content)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.setFocus()
 
     def keyPressEvent(self, event):
-        if event.key() == Qt.Key_Escape or event.key() == Qt.Key_Return:
+        key = event.key()
+        if key == Qt.Key_Escape or key == Qt.Key_Return:
             self.force_close()
+        elif key in (Qt.Key_Down, Qt.Key_Right):
+            self.navigated.emit(1)
+        elif key in (Qt.Key_Up, Qt.Key_Left):
+            self.navigated.emit(-1)
+        elif key in (Qt.Key_PageDown, Qt.Key_PageUp, Qt.Key_Home, Qt.Key_End):
+            self.detail_text_browser.keyPressEvent(event)
         else:
             super().keyPressEvent(event)
 
@@ -148,13 +365,25 @@ class ExtrimistMaterialsApp(QMainWindow):
         self.setWindowTitle("Федеральный список экстремистских материалов")
         self.setGeometry(100, 100, 800, 600)
         self.setMinimumSize(950, 600)
-        self.data = []
-        self.filtered_data = []
-        self.index = {}
+        self.store = RecordStore()
+        self.watchlist = Watchlist(self.store.watchlist_path).load()
+        self.filtered_rows = []
+        self.filtered_scores = {}
+        self.load_worker = None
+        self.export_worker = None
+        self.detail_dialog = None
+        self.detail_position = None
         self.categories = ["Все категории"]
         self.current_sort_column = -1
         self.current_sort_order = Qt.AscendingOrder
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.perform_live_search)
+        self.settings = QSettings("Justice4all", "Justice4all")
+        self.low_power = self.settings.value(LOW_POWER_SETTING, False, type=bool)
         self.rainbow_timer = QTimer(self)
+        self.rainbow_timer.setInterval(RAINBOW_INTERVAL_MS)
         self.current_rainbow_color_index = 0
         self.rainbow_colors = self.generate_rainbow_colors()
         self.search_button_opacity_effect = QGraphicsOpacityEffect(self)
@@ -191,7 +420,7 @@ class ExtrimistMaterialsApp(QMainWindow):
         QApplication.setFont(font)
 
     def get_dark_theme_stylesheet(self):
-        return "\n        QMainWindow { background-color: #2b2b2b; color: #e0e0e0; }\n        QMenuBar { background-color: #3c3c3c; color: #e0e0e0; border-bottom: 1px solid #505050; }\n        QMenuBar::item { background-color: transparent; padding: 5px 10px; }\n        QMenuBar::item:selected { background-color: #555555; }\n        QMenu { background-color: #3c3c3c; border: 1px solid #505050; color: #e0e0e0; }\n        QMenu::item:selected { background-color: #555555; }\n        QLineEdit { background-color: #3c3c3c; border: 1px solid #505050; border-radius: 5px; padding: 12px; color: #e0e0e0; selection-background-color: #d17a3a; text-align: center; font-size: 20pt; }\n        QPushButton { background-color: #d17a3a; color: #ffffff; border: none; border-radius: 5px; padding: 12px 20px; font-weight: bold; font-size: 12pt; }\n        QPushButton:hover { background-color: #e08b47; }\n        QPushButton:pressed { background-color: #c06929; }\n        QTableWidget { background-color: #2b2b2b; alternate-background-color: #353535; color: #e0e0e0; border: 1px solid #505050; gridline-color: #505050; selection-background-color: #4a4a4a; selection-color: #e0e0e0; font-size: 10pt; }\n        QHeaderView::section { background-color: #3c3c3c; color: #e0e0e0; padding: 5px; border: 1px solid #505050; font-weight: bold; font-size: 10pt; }\n        QComboBox { background-color: #3c3c3c; border: 1px solid #505050; border-radius: 5px; padding: 8px; color: #d17a3a; selection-background-color: #d17a3a; selection-color: #ffffff; font-size: 11pt; }\n        QComboBox::drop-down { subcontrol-origin: padding; subcontrol-position: top right; width: 25px; border-left-width: 1px; border-left-color: #505050; border-left-style: solid; border-top-right-radius: 3px; border-bottom-right-radius: 3px; }\n        QComboBox QAbstractItemView { background-color: #3c3c3c; border: 1px solid #505050; selection-background-color: #d17a3a; color: #e0e0e0; font-size: 10pt; }\n        QLabel { color: #e0e0e0; font-size: 10pt; }\n        QToolTip { background-color: #4a4a4a; color: #e0e0e0; border: 1px solid #505050; padding: 5px; border-radius: 3px; font-size: 10pt; }\n        QDialog { background-color: #2b2b2b; color: #e0e0e0; }\n        QTextBrowser { background-color: #3c3c3c; color: #e0e0e0; border: 1px solid #505050; padding: 10px; }\n        "
+        return "\n        QMainWindow { background-color: #2b2b2b; color: #e0e0e0; }\n        QMenuBar { background-color: #3c3c3c; color: #e0e0e0; border-bottom: 1px solid #505050; }\n        QMenuBar::item { background-color: transparent; padding: 5px 10px; }\n        QMenuBar::item:selected { background-color: #555555; }\n        QMenu { background-color: #3c3c3c; border: 1px solid #505050; color: #e0e0e0; }\n        QMenu::item:selected { background-color: #555555; }\n        QLineEdit { background-color: #3c3c3c; border: 1px solid #505050; border-radius: 5px; padding: 12px; color: #e0e0e0; selection-background-color: #d17a3a; text-align: center; font-size: 20pt; }\n        QPushButton { background-color: #d17a3a; color: #ffffff; border: none; border-radius: 5px; padding: 12px 20px; font-weight: bold; font-size: 12pt; }\n        QPushButton:hover { background-color: #e08b47; }\n        QPushButton:pressed { background-color: #c06929; }\n        QTableView { background-color: #2b2b2b; alternate-background-color: #353535; color: #e0e0e0; border: 1px solid #505050; gridline-color: #505050; selection-background-color: #4a4a4a; selection-color: #e0e0e0; font-size: 10pt; }\n        QHeaderView::section { background-color: #3c3c3c; color: #e0e0e0; padding: 5px; border: 1px solid #505050; font-weight: bold; font-size: 10pt; }\n        QComboBox { background-color: #3c3c3c; border: 1px solid #505050; border-radius: 5px; padding: 8px; color: #d17a3a; selection-background-color: #d17a3a; selection-color: #ffffff; font-size: 11pt; }\n        QComboBox::drop-down { subcontrol-origin: padding; subcontrol-position: top right; width: 25px; border-left-width: 1px; border-left-color: #505050; border-left-style: solid; border-top-right-radius: 3px; border-bottom-right-radius: 3px; }\n        QComboBox QAbstractItemView { background-color: #3c3c3c; border: 1px solid #505050; selection-background-color: #d17a3a; color: #e0e0e0; font-size: 10pt; }\n        QLabel { color: #e0e0e0; font-size: 10pt; }\n        QToolTip { background-color: #4a4a4a; color: #e0e0e0; border: 1px solid #505050; padding: 5px; border-radius: 3px; font-size: 10pt; }\n        QDialog { background-color: #2b2b2b; color: #e0e0e0; }\n        QTextBrowser { background-color: #3c3c3c; color: #e0e0e0; border: 1px solid #505050; padding: 10px; }\n        "
 
     def create_menu(self):
         menubar = self.menuBar()
@@ -210,6 +439,39 @@ class ExtrimistMaterialsApp(QMainWindow):
         help_layout.addWidget(help_menu_button)
         help_layout.addStretch()
         menubar.setCornerWidget(help_button_widget, Qt.TopLeftCorner)
+        settings_menu = menubar.addMenu("Настройки")
+        self.low_power_action = QAction("Экономичный режим анимации", self)
+        self.low_power_action.setCheckable(True)
+        self.low_power_action.setChecked(self.low_power)
+        self.low_power_action.toggled.connect(self.set_low_power)
+        settings_menu.addAction(self.low_power_action)
+        data_menu = menubar.addMenu("Данные")
+        self.refresh_action = QAction("Обновить из интернета", self)
+        self.refresh_action.triggered.connect(lambda: self.load_data_from_web())
+        data_menu.addAction(self.refresh_action)
+        self.full_refresh_action = QAction("Полная перезагрузка из интернета", self)
+        self.full_refresh_action.triggered.connect(
+            lambda: self.load_data_from_web(full=True)
+        )
+        data_menu.addAction(self.full_refresh_action)
+        self.cancel_refresh_action = QAction("Отменить обновление", self)
+        self.cancel_refresh_action.setEnabled(False)
+        self.cancel_refresh_action.triggered.connect(self.cancel_web_refresh)
+        data_menu.addAction(self.cancel_refresh_action)
+        data_menu.addSeparator()
+        batch_check_action = QAction("Пакетная проверка списка...", self)
+        batch_check_action.triggered.connect(self.batch_check)
+        data_menu.addAction(batch_check_action)
+        watchlist_action = QAction("Список отслеживания...", self)
+        watchlist_action.triggered.connect(self.edit_watchlist)
+        data_menu.addAction(watchlist_action)
+        data_menu.addSeparator()
+        changes_action = QAction("Изменения после обновления", self)
+        changes_action.triggered.connect(self.show_changes)
+        data_menu.addAction(changes_action)
+        export_changes_action = QAction("Экспорт изменений...", self)
+        export_changes_action.triggered.connect(self.export_changes)
+        data_menu.addAction(export_changes_action)
 
     def create_widgets(self):
         central_widget = QWidget()
@@ -218,6 +480,7 @@ class ExtrimistMaterialsApp(QMainWindow):
         self.search_input.setPlaceholderText("Введите запрос для поиска...")
         self.search_input.setAlignment(Qt.AlignCenter)
         self.search_input.returnPressed.connect(self.perform_search)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
         main_layout.addWidget(self.search_input)
         controls_layout = QHBoxLayout()
         controls_layout.addStretch()
@@ -235,8 +498,13 @@ class ExtrimistMaterialsApp(QMainWindow):
                 "Дата включения",
                 "Суд",
                 "Категория",
+                FUZZY_CRITERIA,
+                RANKED_CRITERIA,
             ]
         )
+        self.search_criteria.currentIndexChanged.connect(
+            lambda: self.search_timer.start()
+        )
         controls_layout.addWidget(self.search_criteria)
         controls_layout.addSpacerItem(
             QSpacerItem(20, 0, QSizePolicy.Fixed, QSizePolicy.Minimum)
@@ -268,7 +536,7 @@ class ExtrimistMaterialsApp(QMainWindow):
         file_load_buttons_vlayout.addWidget(self.howto_button)
         buttons_layout.addLayout(file_load_buttons_vlayout)
         buttons_layout.addStretch()
-        self.search_button = QPushButton("Поиск")
+        self.search_button = RainbowButton("Поиск")
         self.search_button.setGraphicsEffect(self.search_button_opacity_effect)
         self.search_button.clicked.connect(self.perform_search)
         self.search_button.installEventFilter(self)
@@ -280,18 +548,10 @@ class ExtrimistMaterialsApp(QMainWindow):
         self.export_button.clicked.connect(self.export_results)
         buttons_layout.addWidget(self.export_button)
         main_layout.addLayout(buttons_layout)
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(6)
-        self.results_table.setHorizontalHeaderLabels(
-            [
-                "№",
-                "Автор",
-                "Название материала",
-                "Описание",
-                "Дата решения",
-                "Дата включения",
-            ]
-        )
+        self.results_model = MaterialsTableModel(self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
+        self.results_table.verticalHeader().setVisible(False)
         self.results_table.setWordWrap(True)
         font_height = self.results_table.fontMetrics().height()
         self.results_table.verticalHeader().setDefaultSectionSize(font_height * 3 + 10)
@@ -306,11 +566,28 @@ class ExtrimistMaterialsApp(QMainWindow):
         self.results_table.horizontalHeader().sectionClicked.connect(
             self.on_header_clicked
         )
-        self.results_table.itemActivated.connect(self.show_material_details)
-        self.results_table.itemDoubleClicked.connect(self.show_material_details)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.results_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.results_table.activated.connect(self.show_material_details)
+        self.results_table.doubleClicked.connect(self.show_material_details)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_table.setSelectionMode(QAbstractItemView.SingleSelection)
         main_layout.addWidget(self.results_table)
+        self.watch_panel = QWidget()
+        watch_layout = QVBoxLayout(self.watch_panel)
+        watch_layout.setContentsMargins(0, 0, 0, 0)
+        watch_header_layout = QHBoxLayout()
+        self.watch_panel_label = QLabel()
+        watch_header_layout.addWidget(self.watch_panel_label)
+        watch_header_layout.addStretch()
+        clear_watch_button = QPushButton("Очистить")
+        clear_watch_button.clicked.connect(self.clear_watch_alerts)
+        watch_header_layout.addWidget(clear_watch_button)
+        watch_layout.addLayout(watch_header_layout)
+        self.watch_alerts_list = QListWidget()
+        self.watch_alerts_list.setMaximumHeight(font_height * 6)
+        self.watch_alerts_list.itemActivated.connect(self.show_watch_alert)
+        watch_layout.addWidget(self.watch_alerts_list)
+        main_layout.addWidget(self.watch_panel)
+        self.update_watch_panel()
         status_container_layout = QHBoxLayout()
         self.status_label = QLabel("Готово к работе")
         self.status_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
@@ -351,46 +628,94 @@ class ExtrimistMaterialsApp(QMainWindow):
         return colors
 
     def setup_search_button_animation(self):
-        self.rainbow_timer.timeout.connect(self.update_rainbow_color)
-        self.rainbow_timer.start(30)
-        self.pulsating_animation.setDuration(1000)
-        self.pulsating_animation.setLoopCount(-1)
-        self.pulsating_animation.setEasingCurve(QEasingCurve.InOutSine)
-        self.pulsating_animation.setStartValue(1.0)
-        self.pulsating_animation.setEndValue(0.7)
-        self.pulsating_animation.start()
-
-    def update_rainbow_color(self):
-        color = self.rainbow_colors[self.current_rainbow_color_index]
         self.search_button.setStyleSheet(
-            f"""
-            QPushButton {{
+            """
+            QPushButton {
                 background-color: #d17a3a;
-                color: {color.name()};
                 border: none;
                 border-radius: 5px;
                 padding: 12px 20px;
                 font-weight: bold;
                 font-size: 12pt;
-            }}
-            QPushButton:hover {{
+            }
+            QPushButton:hover {
                 background-color: #e08b47;
-            }}
-            QPushButton:pressed {{
+            }
+            QPushButton:pressed {
                 background-color: #c06929;
-            }}
+            }
         """
         )
+        self.search_button.set_text_color(self.rainbow_colors[0])
+        self.rainbow_timer.timeout.connect(self.update_rainbow_color)
+        self.pulsating_animation.setDuration(1000)
+        self.pulsating_animation.setLoopCount(-1)
+        self.pulsating_animation.setEasingCurve(QEasingCurve.InOutSine)
+        self.pulsating_animation.setStartValue(1.0)
+        self.pulsating_animation.setEndValue(0.7)
+        self.start_animation(self.pulsating_animation)
+        self.update_animations()
+
+    def update_rainbow_color(self):
+        color = self.rainbow_colors[self.current_rainbow_color_index]
+        self.search_button.set_text_color(color)
         self.current_rainbow_color_index = (self.current_rainbow_color_index + 1) % len(
             self.rainbow_colors
         )
 
+    def animations_allowed(self):
+        return (
+            not self.low_power
+            and self.isVisible()
+            and not self.isMinimized()
+            and self.isActiveWindow()
+        )
+
+    def start_animation(self, animation):
+        animation.start()
+        if not self.animations_allowed():
+            animation.pause()
+
+    def update_animations(self):
+        animations = (self.pulsating_animation, self.status_alpha_animation)
+        if self.animations_allowed():
+            self.rainbow_timer.start()
+            for animation in animations:
+                if animation.state() == QAbstractAnimation.Paused:
+                    animation.resume()
+            return
+        self.rainbow_timer.stop()
+        for animation in animations:
+            if animation.state() == QAbstractAnimation.Running:
+                animation.pause()
+
+    def set_low_power(self, enabled):
+        self.low_power = enabled
+        self.settings.setValue(LOW_POWER_SETTING, enabled)
+        self.update_animations()
+        if enabled:
+            self.search_button_opacity_effect.setOpacity(1.0)
+            self.status_label_opacity_effect.setOpacity(1.0)
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.ActivationChange, QEvent.WindowStateChange):
+            self.update_animations()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_animations()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_animations()
+
     def on_search_button_enter(self, event):
-        self.rainbow_timer.setInterval(10)
-        self.pulsating_animation.start()
+        self.rainbow_timer.setInterval(RAINBOW_HOVER_INTERVAL_MS)
+        self.start_animation(self.pulsating_animation)
 
     def on_search_button_leave(self, event):
-        self.rainbow_timer.setInterval(30)
+        self.rainbow_timer.setInterval(RAINBOW_INTERVAL_MS)
         self.pulsating_animation.stop()
         self.search_button_opacity_effect.setOpacity(1.0)
 
@@ -408,17 +733,19 @@ class ExtrimistMaterialsApp(QMainWindow):
             f"color: {color.name()}; font-weight: bold; font-size: 18pt;"
         )
 
-    def display_search_status(self, found_count):
+    def display_search_status(self, found_count, approximate=False):
         self.status_alpha_animation.stop()
         self.status_message_label.show()
         self.status_label_opacity_effect.setOpacity(1.0)
         if found_count > 0:
-            self.status_message_label.setText("ЗАПРЕЩЕНО")
+            self.status_message_label.setText(
+                "ВОЗМОЖНО ЗАПРЕЩЕНО" if approximate else "ЗАПРЕЩЕНО"
+            )
             self.status_message_label.setStyleSheet(
                 "color: red; font-weight: bold; font-size: 18pt;"
             )
             self.status_minjust_button.hide()
-            self.status_alpha_animation.start()
+            self.start_animation(self.status_alpha_animation)
         else:
             self.status_message_label.setText("Пока не запрещено")
             self.status_message_label.setStyleSheet(
@@ -429,11 +756,9 @@ class ExtrimistMaterialsApp(QMainWindow):
             self.status_label_opacity_effect.setOpacity(1.0)
 
     def on_header_clicked(self, logical_index):
-        if logical_index not in [0, 5]:
+        sort_key = SORT_COLUMNS.get(logical_index)
+        if sort_key is None:
             return
-        column_map = {0: "id", 5: "entry_date"}
-        sort_key = column_map[logical_index]
-        is_date = sort_key == "entry_date"
         if self.current_sort_column == logical_index:
             self.current_sort_order = (
                 Qt.DescendingOrder
@@ -443,593 +768,103 @@ class ExtrimistMaterialsApp(QMainWindow):
         else:
             self.current_sort_column = logical_index
             self.current_sort_order = Qt.AscendingOrder
-        self.sort_data(sort_key, self.current_sort_order, is_date=is_date)
-
-    def sort_data(self, key, order, is_date=False):
-        if not self.filtered_data:
-            return
+        self.sort_data(sort_key, self.current_sort_order)
 
-        def get_sort_value(item):
-            value = item.get(key)
-            if value is None:
-                return datetime.datetime.min if is_date else ""
-            if key == "id":
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return sys.maxsize
-            if is_date:
-                try:
-                    return datetime.datetime.strptime(value, "%d.%m.%Y")
-                except (ValueError, TypeError):
-                    return datetime.datetime.min
-            return str(value).lower()
-
-        self.filtered_data.sort(key=get_sort_value, reverse=order == Qt.DescendingOrder)
+    def sort_data(self, key, order):
+        self.filtered_rows = self.store.sorted_rows(
+            self.filtered_rows, key, descending=order == Qt.DescendingOrder
+        )
         self.update_results_table()
 
-    def extract_material_category(self, description):
-        desc_lower = description.lower()
-        book_keywords = [
-            "книга",
-            "книги",
-            "брошюра",
-            "учебник",
-            "печатный материал",
-            "монография",
-            "альманах",
-            "печатный",
-            "e-book",
-            "книжка",
-            "том",
-        ]
-        if any(keyword in desc_lower for keyword in book_keywords):
-            return "Книги/Брошюры"
-        journal_keywords = [
-            "журнал",
-            "периодическое издание",
-            "дайджест",
-            "сборник статей",
-        ]
-        if any(keyword in desc_lower for keyword in journal_keywords):
-            return "Журналы"
-        newspaper_keywords = [
-            "газета",
-            "пресса",
-            "еженедельник",
-            "вестник",
-            "статья из газеты",
-        ]
-        if any(keyword in desc_lower for keyword in newspaper_keywords):
-            return "Газеты"
-        leaflet_keywords = [
-            "листовка",
-            "буклет",
-            "памятка",
-            "открытка",
-            "флаер",
-            "плакат",
-            "стикер",
-            "наклейка",
-            "баннер",
-            "агитационный материал",
-        ]
-        if any(keyword in desc_lower for keyword in leaflet_keywords):
-            return "Листовки/Буклеты/Памятки"
-        audio_keywords = [
-            "аудиозапись",
-            "песня",
-            "фонограмма",
-            "аудио",
-            "трек",
-            "звуковой файл",
-            "подкаст",
-            "музыкальная композиция",
-            "музыка",
-        ]
-        audio_extensions = ["mp3", "wav", "flac", "ogg", "aac", "m4a", "wma"]
-        if any(keyword in desc_lower for keyword in audio_keywords) or any(
-            f".{ext}" in desc_lower for ext in audio_extensions
-        ):
-            return "Аудиозаписи"
-        video_keywords = [
-            "видеозапись",
-            "фильм",
-            "ролик",
-            "видеоматериал",
-            "видео",
-            "видеоклип",
-            "кинофильм",
-            "видеоролик",
-            "мультфильм",
-            "сюжет",
-            "трансляция",
-        ]
-        video_extensions = ["avi", "mp4", "mov", "wmv", "mkv", "flv"]
-        if any(keyword in desc_lower for keyword in video_keywords) or any(
-            f".{ext}" in desc_lower for ext in video_extensions
-        ):
-            return "Видеозаписи"
-        image_keywords = [
-            "изображение",
-            "фотография",
-            "рисунок",
-            "картинка",
-            "фото",
-            "графический файл",
-            "демонстрационный материал",
-            "коллаж",
-            "мем",
-            "карикатура",
-        ]
-        image_extensions = ["jpg", "jpeg", "png", "gif", "bmp", "webp"]
-        if any(keyword in desc_lower for keyword in image_keywords) or any(
-            f".{ext}" in desc_lower for ext in image_extensions
-        ):
-            return "Изображения/Фото"
-        web_keywords = [
-            "сайт",
-            "веб-страница",
-            "интернет-ресурс",
-            "онлайн",
-            "социальная сеть",
-            "telegram",
-            "vkontakte",
-            "мессенджер",
-            "форум",
-            "блог",
-            "канал",
-            "сообщество",
-            "url",
-            "ссылка",
-            "веб-сайт",
-            "интернет-портал",
-            "youtube",
-            "vk",
-            "twitter",
-            "facebook",
-            "instagram",
-        ]
-        if any(keyword in desc_lower for keyword in web_keywords) or re.search(
-            "(https?|ftp)://", desc_lower
-        ):
-            return "Веб-материалы"
-        software_keywords = [
-            "программа",
-            "приложение",
-            "по",
-            "софт",
-            "исполняемый файл",
-            "скрипт",
-            "код",
-            "программное обеспечение",
-            "вирус",
-        ]
-        software_extensions = [
-            "exe",
-            "apk",
-            "dmg",
-            "iso",
-            "zip",
-            "rar",
-            "7z",
-            "dll",
-            "bin",
-            "sh",
-            "bat",
-            "py",
-            "js",
-        ]
-        if any(keyword in desc_lower for keyword in software_keywords) or any(
-            f".{ext}" in desc_lower for ext in software_extensions
-        ):
-            return "Программы/ПО"
-        text_document_keywords = [
-            "статья",
-            "публикация",
-            "текст",
-            "документ",
-            "рукопись",
-            "записка",
-            "письмо",
-        ]
-        if any(keyword in desc_lower for keyword in text_document_keywords):
-            return "Статьи/Тексты"
-        return "Прочее"
-
-    def parse_csv_content(self, content):
-        parsed_data = []
-        new_index = {
-            "material_title": [],
-            "author": [],
-            "description": [],
-            "date": [],
-            "court": [],
-            "category": [],
-            "file_info": [],
-        }
-        found_categories = set()
-        seen_ids = set()
-        f = StringIO(content)
-        reader = csv.reader(f, delimiter=";", quotechar='"')
-        for row in reader:
-            try:
-                if not row or not row[0].strip().isdigit():
-                    continue
-                item_id = row[0].strip()
-                if item_id in seen_ids:
-                    continue
-                seen_ids.add(item_id)
-                original_full_description = row[1].strip() if len(row) > 1 else ""
-                work_description = original_full_description
-                date_inclusion = (
-                    row[2].strip()
-                    if len(row) > 2
-                    and re.match("\\d{2}\\.\\d{2}\\.\\d{4}", row[2].strip())
-                    else "Неизвестна"
-                )
-                court_decision = "Неизвестен"
-                decision_date = "Неизвестна"
-                court_name = "Неизвестен"
-                court_match = re.search("\\((решени[ея].*?)\\);?$", work_description)
-                if court_match:
-                    court_decision = court_match.group(1).strip()
-                    work_description = work_description[: court_match.start()].strip()
-                    date_match = re.search(
-                        "от\\s+(\\d{2}\\.\\d{2}\\.\\d{4})", court_decision
-                    )
-                    if date_match:
-                        decision_date = date_match.group(1)
-                        court_name_full = re.search(
-                            "^(.*?)\\sот\\s+\\d{2}\\.\\d{2}\\.\\d{4}", court_decision
-                        )
-                        if court_name_full:
-                            court_name = (
-                                court_name_full.group(1)
-                                .replace("решение", "")
-                                .replace("решением", "")
-                                .strip()
-                            )
-                    else:
-                        court_name = court_decision
-                author = "Неизвестен"
-                material_title = "Без названия"
-                quoted_text_match = re.search("«([^»]+)»", work_description)
-                if quoted_text_match:
-                    full_quoted_text = quoted_text_match.group(1).strip()
-                    publisher_match = re.search(
-                        "^(.*?)(?:\\s*[–-]\\s*(?:Издательство|Verlag|Publishing).*)",
-                        full_quoted_text,
-                    )
-                    if publisher_match:
-                        clean_title = publisher_match.group(1).strip().rstrip(",.")
-                    else:
-                        clean_title = full_quoted_text
-                    material_title = clean_title
-                    author_keyword_match = re.search(
-                        '(?:автора|исполнителя)\\s+([^«"]+)',
-                        work_description,
-                        re.IGNORECASE,
-                    )
-                    if author_keyword_match:
-                        author = (
-                            author_keyword_match.group(1).strip().rstrip("«").strip()
-                        )
-                    elif "имя автора" in work_description.lower():
-                        author_in_title_match = re.match(
-                            "^([\\w\\s-]+?\\.)\\s+([\\w\\s\\W]+)", clean_title
-                        )
-                        if author_in_title_match:
-                            author = author_in_title_match.group(1).strip().rstrip(".")
-                            material_title = author_in_title_match.group(2).strip()
-                category = self.extract_material_category(original_full_description)
-                found_categories.add(category)
-                display_description = (
-                    work_description[:200] + "..."
-                    if len(work_description) > 200
-                    else work_description
-                )
-                parsed_data.append(
-                    {
-                        "id": item_id,
-                        "material_title": material_title,
-                        "author_or_publisher": author,
-                        "description": display_description,
-                        "original_description": original_full_description,
-                        "entry_date": date_inclusion,
-                        "links": [],
-                        "court_decision": court_decision,
-                        "decision_date": decision_date,
-                        "court_name": court_name,
-                        "category": category,
-                        "file_info": "Не указано",
-                    }
-                )
-                new_index["material_title"].append(material_title.lower())
-                new_index["author"].append(author.lower())
-                new_index["description"].append(work_description.lower())
-                new_index["date"].append(date_inclusion.lower())
-                new_index["court"].append(court_decision.lower())
-                new_index["category"].append(category.lower())
-                new_index["file_info"].append("не указано")
-            except (IndexError, Exception):
-                continue
-        sorted_categories = sorted(list(found_categories))
-        sorted_categories.insert(0, "Все категории")
-        return parsed_data, new_index, sorted_categories
-
-    def parse_rss_content(self, content):
-        soup = BeautifulSoup(content, "xml")
-        items = soup.find_all("item")
-        parsed_data = []
-        new_index = {
-            "material_title": [],
-            "author": [],
-            "description": [],
-            "date": [],
-            "court": [],
-            "category": [],
-            "file_info": [],
-        }
-        found_categories = set()
-        seen_ids = set()
-        for item in items:
-            try:
-                guid = item.guid.text.strip() if item.guid else None
-                title_text = item.title.text.strip() if item.title else ""
-                item_id_from_title = re.match("^\\s*(\\d+)", title_text)
-                item_id = item_id_from_title.group(1) if item_id_from_title else guid
-                if not item_id or item_id in seen_ids:
-                    continue
-                seen_ids.add(item_id)
-                date_inclusion = "Неизвестна"
-                if item.pubDate and item.pubDate.text:
-                    try:
-                        pub_date = datetime.datetime.strptime(
-                            item.pubDate.text, "%a, %d %b %Y %H:%M:%S %z"
-                        )
-                        date_inclusion = pub_date.strftime("%d.%m.%Y")
-                    except ValueError:
-                        pass
-                original_full_description = BeautifulSoup(
-                    item.description.text if item.description else "", "html.parser"
-                ).get_text(separator=" ", strip=True)
-                work_description = original_full_description
-                court_decision = "Неизвестен"
-                decision_date = "Неизвестна"
-                court_name = "Неизвестен"
-                court_match = re.search("\\((решени[ея].*?)\\)$", work_description)
-                if court_match:
-                    court_decision = court_match.group(1).strip()
-                    work_description = work_description[: court_match.start()].strip()
-                    date_match = re.search(
-                        "от\\s+(\\d{2}\\.\\d{2}\\.\\d{4})", court_decision
-                    )
-                    if date_match:
-                        decision_date = date_match.group(1)
-                        court_name_full = re.search(
-                            "^(.*?)\\sот\\s+\\d{2}\\.\\d{2}\\.\\d{4}", court_decision
-                        )
-                        if court_name_full:
-                            court_name = (
-                                court_name_full.group(1)
-                                .replace("решение", "")
-                                .replace("решением", "")
-                                .strip()
-                            )
-                    else:
-                        court_name = court_decision
-                material_title = re.sub("^\\d+:\\s*", "", title_text)
-                author = "Неизвестен"
-                author_keyword_match = re.search(
-                    '(?:автора|исполнителя)\\s+([^«"]+)',
-                    work_description,
-                    re.IGNORECASE,
-                )
-                if author_keyword_match:
-                    author = author_keyword_match.group(1).strip().rstrip("«").strip()
-                category = self.extract_material_category(original_full_description)
-                found_categories.add(category)
-                link = item.link.text if item.link else ""
-                display_description = (
-                    work_description[:200] + "..."
-                    if len(work_description) > 200
-                    else work_description
-                )
-                parsed_data.append(
-                    {
-                        "id": item_id,
-                        "material_title": material_title,
-                        "author_or_publisher": author,
-                        "description": display_description,
-                        "original_description": original_full_description,
-                        "entry_date": date_inclusion,
-                        "links": [link] if link else [],
-                        "court_decision": court_decision,
-                        "decision_date": decision_date,
-                        "court_name": court_name,
-                        "category": category,
-                        "file_info": "Не указано",
-                    }
-                )
-                new_index["material_title"].append(material_title.lower())
-                new_index["author"].append(author.lower())
-                new_index["description"].append(work_description.lower())
-                new_index["date"].append(date_inclusion.lower())
-                new_index["court"].append(court_decision.lower())
-                new_index["category"].append(category.lower())
-                new_index["file_info"].append("не указано")
-            except Exception:
-                continue
-        sorted_categories = sorted(list(found_categories))
-        sorted_categories.insert(0, "Все категории")
-        return parsed_data, new_index, sorted_categories
-
-    def decode_content_robust(self, content_bytes):
-        for encoding in ENCODINGS_TO_TRY:
-            try:
-                decoded = content_bytes.decode(encoding)
-                if any(ord(c) > 127 for c in decoded) and "юст" in decoded.lower():
-                    return decoded
-            except UnicodeDecodeError:
-                continue
-        raise UnicodeDecodeError(
-            "Unable to decode content with any of the tried encodings."
-        )
+    def load_data_from_web(self, full=False):
+        if self.load_worker is not None:
+            return False
+        delta_from = None if full else self.store.max_id()
+        self.load_worker = DataLoadWorker(self, delta_from=delta_from)
+        self.load_worker.progress.connect(self.status_label.setText)
+        self.load_worker.records_parsed.connect(self.on_records_parsed)
+        self.load_worker.loaded.connect(self.on_web_data_loaded)
+        self.load_worker.merged.connect(self.on_web_data_merged)
+        self.load_worker.unchanged.connect(self.on_web_data_unchanged)
+        self.load_worker.failed.connect(self.on_web_data_failed)
+        self.load_worker.finished.connect(self.on_load_worker_finished)
+        self.refresh_action.setEnabled(False)
+        self.full_refresh_action.setEnabled(False)
+        self.cancel_refresh_action.setEnabled(True)
+        self.load_worker.start()
+        return True
 
-    def load_data_from_web(self):
-        self.status_label.setText("Загрузка данных из интернета (RSS)...")
-        QApplication.processEvents()
-        try:
-            response = requests.get(RSS_URL, verify=False, timeout=30)
-            response.raise_for_status()
-            decoded_content = self.decode_content_robust(response.content)
-            self.data, self.index, updated_categories = self.parse_rss_content(
-                decoded_content
-            )
-            self.update_category_filter(updated_categories)
-            self.filtered_data = self.data.copy()
-            self.update_results_table()
-            self.status_label.setText(
-                f"Загружено {len(self.data)} записей из RSS-ленты."
-            )
-            self.save_data()
-            return True
-        except Exception as e:
-            self.status_label.setText(
-                f"Ошибка загрузки RSS: {str(e)}. Попытка загрузки CSV..."
-            )
-            QApplication.processEvents()
-            return self.load_csv_from_web_smart()
+    def cancel_web_refresh(self):
+        if self.load_worker is not None:
+            self.status_label.setText("Отмена обновления данных...")
+            self.load_worker.cancel()
 
-    def load_csv_from_web_smart(self):
-        self.status_label.setText("Попытка загрузки CSV из интернета (requests)...")
-        QApplication.processEvents()
+    def on_records_parsed(self, stage, count):
+        self.status_label.setText(f"{stage}: обработано {count} записей...")
+
+    def on_web_data_loaded(self, data, index, search_index, categories, message):
+        self.keep_previous_data()
+        self.store.replace(data, index, search_index)
+        self.update_category_filter(categories)
+        self.filtered_scores = {}
+        self.filtered_rows = list(range(len(self.store)))
+        self.update_results_table()
+        self.status_label.setText(message.format(len(self.store)))
+        self.save_data()
+        self.commit_http_cache()
+        self.screen_watchlist()
+
+    def commit_http_cache(self):
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3",
-                "Referer": "https://minjust.gov.ru/ru/extremist-materials/",
-            }
-            response = requests.get(CSV_URL, headers=headers, verify=False, timeout=30)
-            response.raise_for_status()
-            decoded_content = self.decode_content_robust(response.content)
-            self.data, self.index, updated_categories = self.parse_csv_content(
-                decoded_content
-            )
-            self.update_category_filter(updated_categories)
-            self.filtered_data = self.data.copy()
-            self.update_results_table()
-            self.status_label.setText(
-                f"Загружено {len(self.data)} записей из CSV-файла."
-            )
-            self.save_data()
-            return True
-        except Exception as e:
-            self.status_label.setText(
-                f"Ошибка загрузки CSV (requests): {str(e)}. Попытка через wget/curl..."
-            )
-            QApplication.processEvents()
-            return self.load_csv_from_web_cli()
+            self.load_worker.commit_http_cache()
+        except OSError:
+            pass
 
-    def load_csv_from_web_cli(self):
+    def on_web_data_unchanged(self, stage):
+        self.commit_http_cache()
         self.status_label.setText(
-            "Попытка загрузки CSV через командную строку (wget/curl)..."
+            f"Данные на сайте не изменились ({stage}), используется сохраненная копия."
         )
-        QApplication.processEvents()
-        temp_csv_file = "temp_minjust_export.csv"
-        command = []
-        if platform.system() == "Windows":
-            try:
-                subprocess.run(["curl", "--version"], capture_output=True, check=True)
-                command = [
-                    "curl",
-                    "-k",
-                    "-o",
-                    temp_csv_file,
-                    CSV_URL,
-                    "-H",
-                    "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                    "-H",
-                    "Referer: https://minjust.gov.ru/ru/extremist-materials/",
-                ]
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                try:
-                    subprocess.run(
-                        ["wget", "--version"], capture_output=True, check=True
-                    )
-                    command = [
-                        "wget",
-                        "--no-check-certificate",
-                        "-O",
-                        temp_csv_file,
-                        CSV_URL,
-                        "--header=User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                        "--header=Referer: https://minjust.gov.ru/ru/extremist-materials/",
-                    ]
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    self.status_label.setText(
-                        "Ошибка: wget или curl не найдены. Не удалось загрузить CSV через CLI."
-                    )
-                    return False
-        else:
+
+    def on_web_data_merged(self, data, index):
+        if data:
+            self.keep_previous_data(merge=True)
+        start = self.store.merge(data, index)
+        added = len(self.store) - start
+        if added:
+            self.show_store_records()
             try:
-                subprocess.run(["wget", "--version"], capture_output=True, check=True)
-                command = [
-                    "wget",
-                    "--no-check-certificate",
-                    "-O",
-                    temp_csv_file,
-                    CSV_URL,
-                    "--header=User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                    "--header=Referer: https://minjust.gov.ru/ru/extremist-materials/",
-                ]
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                try:
-                    subprocess.run(
-                        ["curl", "--version"], capture_output=True, check=True
-                    )
-                    command = [
-                        "curl",
-                        "-k",
-                        "-o",
-                        temp_csv_file,
-                        CSV_URL,
-                        "-H",
-                        "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                        "-H",
-                        "Referer: https://minjust.gov.ru/ru/extremist-materials/",
-                    ]
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    self.status_label.setText(
-                        "Ошибка: wget или curl не найдены. Не удалось загрузить CSV через CLI."
-                    )
-                    return False
-        if not command:
-            return False
-        try:
-            subprocess.run(command, check=True, capture_output=True, text=False)
-            with open(temp_csv_file, "rb") as f:
-                content_bytes = f.read()
-            decoded_content = self.decode_content_robust(content_bytes)
-            self.data, self.index, updated_categories = self.parse_csv_content(
-                decoded_content
-            )
-            self.update_category_filter(updated_categories)
-            self.filtered_data = self.data.copy()
-            self.update_results_table()
-            self.status_label.setText(
-                f"Загружено {len(self.data)} записей из CSV-файла (CLI)."
-            )
-            self.save_data()
-            os.remove(temp_csv_file)
-            return True
-        except Exception as e:
-            self.status_label.setText(f"Ошибка загрузки CSV (CLI): {str(e)}")
-            if os.path.exists(temp_csv_file):
-                os.remove(temp_csv_file)
-            return False
+                self.store.append_journal(start)
+            except Exception as e:
+                self.status_label.setText(f"Ошибка сохранения данных: {str(e)}")
+                return
+        self.commit_http_cache()
+        self.status_label.setText(f"Добавлено {added} новых записей из RSS-ленты.")
+        self.screen_watchlist()
+
+    def show_store_records(self):
+        self.update_category_filter(self.store.categories())
+        self.filtered_scores = {}
+        self.filtered_rows = self.store.newest_first()
+        self.update_results_table()
+
+    def on_web_data_failed(self, message):
+        self.status_label.setText(message)
+
+    def on_load_worker_finished(self):
+        self.load_worker.deleteLater()
+        self.load_worker = None
+        self.refresh_action.setEnabled(True)
+        self.full_refresh_action.setEnabled(True)
+        self.cancel_refresh_action.setEnabled(False)
+
+    def closeEvent(self, event):
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+            self.load_worker.wait()
+        if self.export_worker is not None:
+            self.export_worker.wait()
+        super().closeEvent(event)
 
     def load_data_from_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -1040,27 +875,23 @@ class ExtrimistMaterialsApp(QMainWindow):
         )
         if file_path:
             try:
-                with open(file_path, "rb") as f:
-                    content_bytes = f.read()
-                decoded_content = self.decode_content_robust(content_bytes)
-                if file_path.lower().endswith((".csv", ".txt")):
-                    self.data, self.index, updated_categories = self.parse_csv_content(
-                        decoded_content
-                    )
-                else:
-                    self.data, self.index, updated_categories = self.parse_rss_content(
-                        decoded_content
-                    )
+                (data, index, updated_categories) = parse_file(file_path)
+                self.keep_previous_data()
+                self.store.replace(data, index)
                 self.update_category_filter(updated_categories)
-                self.filtered_data = self.data.copy()
+                self.filtered_scores = {}
+                self.filtered_rows = list(range(len(self.store)))
                 self.update_results_table()
                 current_date = datetime.date.today().strftime("%d.%m.%Y")
                 self.status_label.setText(
-                    f"Загружено {len(self.data)} записей из файла, данные актуальны на <span style='color: orange;'>{current_date}</span>"
+                    f"Загружено {len(self.store)} записей из файла, данные актуальны на <span style='color: orange;'>{current_date}</span>"
                 )
                 self.status_label.setStyleSheet("")
                 self.status_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
                 self.save_data()
+                if os.path.exists(self.store.http_cache_path):
+                    os.remove(self.store.http_cache_path)
+                self.screen_watchlist()
             except Exception as e:
                 self.status_label.setText(
                     f"Ошибка загрузки или обработки файла: {str(e)}"
@@ -1068,80 +899,32 @@ class ExtrimistMaterialsApp(QMainWindow):
                 self.status_label.setStyleSheet("QLabel { color: red; }")
                 self.status_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
 
+    def keep_previous_data(self, merge=False):
+        try:
+            self.store.keep_previous(merge)
+        except OSError:
+            pass
+
     def save_data(self):
         try:
-            with open(DATA_FILE_PATH, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=4)
+            self.store.save()
         except Exception as e:
             self.status_label.setText(f"Ошибка сохранения данных: {str(e)}")
 
     def load_saved_data(self):
-        if os.path.exists(DATA_FILE_PATH):
-            try:
-                with open(DATA_FILE_PATH, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
-                self.index = {
-                    "material_title": [],
-                    "author": [],
-                    "description": [],
-                    "date": [],
-                    "court": [],
-                    "category": [],
-                    "file_info": [],
-                }
-                found_categories = set()
-                for (i, item) in enumerate(self.data):
-                    item.setdefault("id", str(i + 1))
-                    item.setdefault("material_title", "Без названия")
-                    item.setdefault("author_or_publisher", "Неизвестен")
-                    item.setdefault("description", "")
-                    item.setdefault("original_description", item.get("description", ""))
-                    item.setdefault("entry_date", "Неизвестна")
-                    item.setdefault("links", [])
-                    item.setdefault("court_decision", "Неизвестен")
-                    item.setdefault("decision_date", "Неизвестна")
-                    item.setdefault("court_name", "Неизвестен")
-                    item.setdefault(
-                        "category",
-                        self.extract_material_category(
-                            item.get("original_description", "")
-                            + " "
-                            + item.get("material_title", "")
-                        ),
-                    )
-                    item.setdefault("file_info", "Не указано")
-                    self.index["material_title"].append(
-                        item.get("material_title", "").lower()
-                    )
-                    self.index["author"].append(
-                        item.get("author_or_publisher", "").lower()
-                    )
-                    self.index["description"].append(
-                        item.get("original_description", "").lower()
-                    )
-                    self.index["date"].append(item.get("entry_date", "").lower())
-                    self.index["court"].append(item.get("court_decision", "").lower())
-                    self.index["category"].append(item.get("category", "").lower())
-                    self.index["file_info"].append(item.get("file_info", "").lower())
-                    found_categories.add(item["category"])
-                sorted_categories = sorted(list(found_categories))
-                sorted_categories.insert(0, "Все категории")
-                self.update_category_filter(sorted_categories)
-                self.filtered_data = self.data.copy()
-                self.filtered_data.sort(key=lambda x: int(x.get("id", 0)), reverse=True)
-                self.update_results_table()
-                self.status_label.setText(
-                    f"Загружено {len(self.data)} записей из сохраненного файла."
-                )
-                return True
-            except Exception as e:
-                self.status_label.setText(
-                    f"Ошибка загрузки сохраненных данных: {str(e)}"
-                )
-                if os.path.exists(DATA_FILE_PATH):
-                    os.remove(DATA_FILE_PATH)
+        try:
+            if not self.store.load():
                 return False
-        return False
+        except Exception as e:
+            self.status_label.setText(f"Ошибка загрузки сохраненных данных: {str(e)}")
+            if os.path.exists(self.store.data_path):
+                os.remove(self.store.data_path)
+            return False
+        self.show_store_records()
+        self.status_label.setText(
+            f"Загружено {len(self.store)} записей из сохраненного файла."
+        )
+        return True
 
     def update_category_filter(self, new_categories):
         self.category_filter.blockSignals(True)
@@ -1149,7 +932,21 @@ class ExtrimistMaterialsApp(QMainWindow):
         self.category_filter.addItems(new_categories)
         self.category_filter.blockSignals(False)
 
+    def perform_live_search(self):
+        if (
+            not self.search_input.text().strip()
+            and self.category_filter.currentText() == "Все категории"
+        ):
+            self.status_alpha_animation.stop()
+            self.status_message_label.hide()
+            self.filtered_scores = {}
+            self.filtered_rows = self.store.newest_first()
+            self.update_results_table()
+            return
+        self.perform_search()
+
     def perform_search(self):
+        self.search_timer.stop()
         query = self.search_input.text().lower().strip()
         selected_category = self.category_filter.currentText()
         if not query and selected_category == "Все категории":
@@ -1158,230 +955,245 @@ class ExtrimistMaterialsApp(QMainWindow):
             )
             return
         selected_criteria = self.search_criteria.currentText()
-        self.filtered_data = []
-        for (i, item) in enumerate(self.data):
-            if (
-                selected_category != "Все категории"
-                and item.get("category", "").lower() != selected_category.lower()
-            ):
-                continue
-            if query:
-                match = False
-                if selected_criteria == "Все поля":
-                    if (
-                        query in self.index["material_title"][i]
-                        or query in self.index["author"][i]
-                        or query in self.index["description"][i]
-                        or query in self.index["date"][i]
-                        or query in self.index["court"][i]
-                        or query in self.index["category"][i]
-                        or query in self.index["file_info"][i]
-                    ):
-                        match = True
-                elif selected_criteria == "Номер" and query == item.get("id"):
-                    match = True
-                elif (
-                    selected_criteria == "Название материала"
-                    and query in self.index["material_title"][i]
-                ):
-                    match = True
-                elif selected_criteria == "Автор" and query in self.index["author"][i]:
-                    match = True
-                elif (
-                    selected_criteria == "Описание"
-                    and query in self.index["description"][i]
-                ):
-                    match = True
-                elif (
-                    selected_criteria == "Дата включения"
-                    and query in self.index["date"][i]
-                ):
-                    match = True
-                elif selected_criteria == "Суд" and query in self.index["court"][i]:
-                    match = True
-                elif (
-                    selected_criteria == "Категория"
-                    and query in self.index["category"][i]
-                ):
-                    match = True
-                if match:
-                    self.filtered_data.append(item)
-            else:
-                self.filtered_data.append(item)
-        if self.current_sort_column != -1:
-            column_map = {
-                0: "id",
-                1: "material_title",
-                2: "author_or_publisher",
-                3: "original_description",
-                5: "entry_date",
-            }
-            sort_key = column_map.get(self.current_sort_column)
-            if sort_key:
-                self.sort_data(
-                    sort_key, self.current_sort_order, is_date=sort_key == "entry_date"
-                )
-            else:
-                self.update_results_table()
+        if selected_criteria in SCORED_CRITERIA:
+            matches = self.store.scored_matches(
+                query, selected_criteria, selected_category
+            )
+            self.filtered_scores = (
+                dict(matches) if selected_criteria == FUZZY_CRITERIA else {}
+            )
+            self.filtered_rows = [row for (row, _) in matches]
+        else:
+            try:
+                rows = self.store.search(query, selected_criteria, selected_category)
+            except QuerySyntaxError as e:
+                self.status_label.setText(f"Ошибка в запросе: {str(e)}")
+                return
+            self.filtered_scores = {}
+            self.filtered_rows = rows
+        sort_key = SORT_COLUMNS.get(self.current_sort_column)
+        if sort_key and selected_criteria not in SCORED_CRITERIA:
+            self.sort_data(sort_key, self.current_sort_order)
         else:
             self.update_results_table()
-        self.display_search_status(len(self.filtered_data))
+        self.display_search_status(
+            len(self.filtered_rows), selected_criteria in SCORED_CRITERIA
+        )
 
     def update_results_table(self):
-        self.results_table.setRowCount(len(self.filtered_data))
-        for (row, item) in enumerate(self.filtered_data):
-            self.results_table.setItem(
-                row, 0, QTableWidgetItem(str(item.get("id", "N/A")))
-            )
-            author_item = QTableWidgetItem(
-                item.get("author_or_publisher", "Неизвестен")
-            )
-            author_item.setFlags(author_item.flags() & ~Qt.ItemIsEditable)
-            self.results_table.setItem(row, 1, author_item)
-            title_item = QTableWidgetItem(item.get("material_title", "Не указано"))
-            title_item.setFlags(title_item.flags() & ~Qt.ItemIsEditable)
-            self.results_table.setItem(row, 2, title_item)
-            description_str = item.get("description", "Отсутствует")
-            original_description_for_tooltip = item.get(
-                "original_description", description_str
-            )
-            desc_item = QTableWidgetItem(description_str)
-            desc_item.setToolTip(original_description_for_tooltip)
-            desc_item.setFlags(desc_item.flags() & ~Qt.ItemIsEditable)
-            self.results_table.setItem(row, 3, desc_item)
-            decision_date_item = QTableWidgetItem(
-                item.get("decision_date", "Неизвестна")
+        self.results_model.set_rows(
+            self.store.data, self.filtered_rows, self.filtered_scores
+        )
+        if self.filtered_scores:
+            self.results_table.horizontalHeader().setSectionResizeMode(
+                len(MaterialsTableModel.COLUMNS), QHeaderView.ResizeToContents
             )
-            decision_date_item.setFlags(decision_date_item.flags() & ~Qt.ItemIsEditable)
-            self.results_table.setItem(row, 4, decision_date_item)
-            entry_date_item = QTableWidgetItem(item.get("entry_date", "Неизвестна"))
-            entry_date_item.setFlags(entry_date_item.flags() & ~Qt.ItemIsEditable)
-            self.results_table.setItem(row, 5, entry_date_item)
-        self.results_table.verticalHeader().setVisible(False)
 
-    def show_material_details(self, item_table_widget):
-        if isinstance(item_table_widget, QTableWidgetItem):
-            row_index = item_table_widget.row()
-        else:
-            row_index = self.results_table.row(item_table_widget)
-        if 0 <= row_index < len(self.filtered_data):
-            selected_material = self.filtered_data[row_index]
-            dialog = MaterialDetailDialog(self, selected_material)
-            dialog.exec_()
+    def show_material_details(self, index):
+        row_index = index.row()
+        if 0 <= row_index < len(self.filtered_rows):
+            self.detail_position = row_index
+            self.show_record_details(self.results_model.rows[row_index])
+
+    def show_record_details(self, row):
+        if self.detail_dialog is None:
+            self.detail_dialog = MaterialDetailDialog(self)
+            self.detail_dialog.navigated.connect(self.step_material_details)
+        key = (self.store.data.value(row, "id"), self.store.data.hashes[row])
+        self.detail_dialog.show_material(key, self.store.data[row])
+
+    def step_material_details(self, step):
+        if self.detail_position is None:
+            return
+        row_index = self.detail_position + step
+        if not 0 <= row_index < len(self.filtered_rows):
+            return
+        self.detail_position = row_index
+        self.results_table.selectRow(row_index)
+        self.show_record_details(self.results_model.rows[row_index])
 
     def export_results(self):
-        if not self.filtered_data:
+        if not self.filtered_rows:
             self.status_label.setText("Нет данных для экспорта")
             return
+        if self.export_worker is not None:
+            self.status_label.setText("Экспорт уже выполняется")
+            return
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Экспорт результатов",
             "",
-            "Текстовые файлы (*.txt);;CSV файлы (*.csv);;HTML файлы (*.html)",
+            "Текстовые файлы (*.txt);;CSV файлы (*.csv);;HTML файлы (*.html);;JSON Lines (*.jsonl);;Сжатые файлы (*.txt.gz *.csv.gz *.html.gz *.jsonl.gz)",
+        )
+        if not file_path:
+            return
+        self.export_worker = ExportWorker(
+            self, file_path, self.store.data, list(self.filtered_rows)
+        )
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.exported.connect(self.on_export_finished)
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_worker.finished.connect(self.on_export_worker_finished)
+        self.export_button.setEnabled(False)
+        self.export_worker.start()
+
+    def on_export_progress(self, done, total):
+        self.status_label.setText(f"Экспорт: {done} из {total} записей...")
+
+    def on_export_finished(self, file_path):
+        self.status_label.setText(f"Результаты экспортированы в {file_path}")
+
+    def on_export_failed(self, message):
+        self.status_label.setText(f"Ошибка экспорта: {message}")
+
+    def on_export_worker_finished(self):
+        self.export_worker.deleteLater()
+        self.export_worker = None
+        self.export_button.setEnabled(True)
+
+    def batch_check(self):
+        source_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Выберите список для проверки",
+            "",
+            "Списки (*.txt *.csv);;All Files (*)",
+        )
+        if not source_path:
+            return
+        report_path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить отчет", "", "CSV файлы (*.csv);;JSON файлы (*.json)"
+        )
+        if not report_path:
+            return
+        fields = SEARCH_CRITERIA_FIELDS.get(
+            self.search_criteria.currentText(), SEARCH_CRITERIA_FIELDS["Все поля"]
+        )
+        column = 0 if source_path.lower().endswith(".csv") else None
+        output_format = "json" if report_path.lower().endswith(".json") else "csv"
+        try:
+            with open(source_path, "r", encoding="utf-8-sig") as f:
+                matcher = BatchMatcher(iter_batch_queries(f, column))
+            hits = matcher.run(self.store, fields)
+            with open(report_path, "w", encoding="utf-8", newline="") as f:
+                matched = write_batch_report(
+                    f, matcher, hits, self.store, output_format
+                )
+            self.status_label.setText(
+                f"Проверено запросов: {len(matcher)}, найдены совпадения: {matched}. Отчет сохранен в {report_path}"
+            )
+        except Exception as e:
+            self.status_label.setText(f"Ошибка пакетной проверки: {str(e)}")
+
+    def store_changes(self):
+        try:
+            diff = self.store.changes()
+        except Exception as e:
+            self.status_label.setText(f"Ошибка сравнения версий списка: {str(e)}")
+            return None
+        if diff is None:
+            self.status_label.setText("Предыдущая версия списка не сохранена.")
+        return diff
+
+    def show_changes(self):
+        diff = self.store_changes()
+        if diff is None:
+            return
+        self.filtered_scores = {}
+        self.filtered_rows = diff.changed_rows()
+        self.update_results_table()
+        self.status_label.setText(
+            f"После обновления добавлено записей: {len(diff.added)}, изменено: {len(diff.modified)}, удалено: {len(diff.removed)}."
+        )
+
+    def export_changes(self):
+        diff = self.store_changes()
+        if diff is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Экспорт изменений",
+            "",
+            "CSV файлы (*.csv);;JSON Lines (*.jsonl);;Сжатые файлы (*.csv.gz *.jsonl.gz)",
+        )
+        if not file_path:
+            return
+        try:
+            count = export_diff_to_path(file_path, diff, self.store.data)
+            self.status_label.setText(
+                f"Изменений: {count}. Отчет сохранен в {file_path}"
+            )
+        except Exception as e:
+            self.status_label.setText(f"Ошибка экспорта изменений: {str(e)}")
+
+    def save_watchlist(self, action, *args):
+        try:
+            action(*args)
+        except OSError as e:
+            self.status_label.setText(
+                f"Ошибка сохранения списка отслеживания: {str(e)}"
+            )
+            return False
+        finally:
+            self.update_watch_panel()
+        return True
+
+    def screen_watchlist(self):
+        self.save_watchlist(self.watchlist.screen, self.store)
+
+    def update_watch_panel(self):
+        alerts = self.watchlist.alerts
+        self.watch_panel_label.setText(
+            f"Уведомления по списку отслеживания: {len(alerts)}"
+        )
+        self.watch_alerts_list.clear()
+        for alert in alerts:
+            self.watch_alerts_list.addItem(
+                f"«{alert['query']}» — № {alert['id']}: {alert['material_title']} ({', '.join(alert['fields'])})"
+            )
+        self.watch_panel.setVisible(bool(alerts))
+
+    def show_watch_alert(self, item):
+        alert = self.watchlist.alerts[self.watch_alerts_list.row(item)]
+        rows = self.store.search_index.lookup_id(alert["id"])
+        if not rows:
+            self.status_label.setText(f"Запись № {alert['id']} больше нет в списке.")
+            return
+        self.detail_position = None
+        self.show_record_details(rows[0])
+
+    def clear_watch_alerts(self):
+        self.save_watchlist(self.watchlist.clear_alerts)
+
+    def edit_watchlist(self):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Список отслеживания")
+        dialog.setGeometry(self.x() + 100, self.y() + 100, 600, 400)
+        dialog.setStyleSheet(self.get_dark_theme_stylesheet())
+        layout = QVBoxLayout(dialog)
+        hint_label = QLabel(
+            "Названия и авторы для отслеживания, по одному на строку. После каждого обновления они проверяются только по новым записям списка."
+        )
+        hint_label.setWordWrap(True)
+        layout.addWidget(hint_label)
+        queries_edit = QPlainTextEdit("\n".join(self.watchlist.queries))
+        layout.addWidget(queries_edit)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        save_button = QPushButton("Сохранить")
+        save_button.clicked.connect(dialog.accept)
+        buttons_layout.addWidget(save_button)
+        cancel_button = QPushButton("Отмена")
+        cancel_button.clicked.connect(dialog.reject)
+        buttons_layout.addWidget(cancel_button)
+        layout.addLayout(buttons_layout)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        queries = queries_edit.toPlainText().splitlines()
+        if not self.save_watchlist(self.watchlist.update, queries, self.store):
+            return
+        self.status_label.setText(
+            f"В списке отслеживания запросов: {len(self.watchlist.queries)}."
         )
-        if file_path:
-            try:
-                if file_path.endswith(".csv"):
-                    with open(file_path, "w", encoding="utf-8", newline="") as f:
-                        writer = csv.writer(f, delimiter=";")
-                        writer.writerow(
-                            [
-                                "№",
-                                "Название материала",
-                                "Автор/Издатель",
-                                "Полное описание",
-                                "Дата включения",
-                                "Суд",
-                                "Категория",
-                                "Ссылки",
-                            ]
-                        )
-                        for item in self.filtered_data:
-                            desc = (
-                                item.get("original_description", "")
-                                .replace("\n", " ")
-                                .replace("\r", " ")
-                                .replace(";", ",")
-                            )
-                            links = ", ".join(item.get("links", []))
-                            writer.writerow(
-                                [
-                                    item.get("id", "N/A"),
-                                    item.get("material_title", "Без названия"),
-                                    item.get("author_or_publisher", "Неизвестен"),
-                                    desc,
-                                    item.get("entry_date", "Неизвестна"),
-                                    item.get("court_name", "Неизвестен"),
-                                    item.get("category", "Прочее"),
-                                    links,
-                                ]
-                            )
-                elif file_path.endswith(".html"):
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(
-                            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>Экстремистские материалы</title>\n<style>\nbody { font-family: 'Ubuntu', sans-serif; background-color: #2b2b2b; color: #e0e0e0; }\ntable { width: 100%; border-collapse: collapse; margin-top: 20px; }\nth, td { border: 1px solid #505050; padding: 8px; text-align: left; }\nth { background-color: #3c3c3c; color: #d17a3a; }\ntr:nth-child(even) { background-color: #353535; }\na { color: #e08b47; text-decoration: none; }\na:hover { text-decoration: underline; }\n</style>\n</head>\n<body>\n<h1>Список экстремистских материалов</h1>\n<table>\n<thead>\n<tr><th>№</th><th>Название материала</th><th>Автор/Издатель</th><th>Описание</th><th>Дата включения</th><th>Суд</th><th>Категория</th><th>Ссылки</th></tr>\n</thead>\n<tbody>\n"
-                        )
-                        for item in self.filtered_data:
-                            html_escape = (
-                                lambda s: str(s)
-                                .replace("&", "&amp;")
-                                .replace("<", "&lt;")
-                                .replace(">", "&gt;")
-                                .replace('"', "&quot;")
-                                .replace("'", "&#39;")
-                            )
-                            item_id_html = html_escape(item.get("id", "N/A"))
-                            title_html = html_escape(
-                                item.get("material_title", "Без названия")
-                            )
-                            author_html = html_escape(
-                                item.get("author_or_publisher", "Неизвестен")
-                            )
-                            desc_html = html_escape(
-                                item.get("original_description", "")
-                            )
-                            date_html = html_escape(
-                                item.get("entry_date", "Неизвестна")
-                            )
-                            court_html = html_escape(
-                                item.get("court_name", "Неизвестен")
-                            )
-                            category_html = html_escape(item.get("category", "Прочее"))
-                            links_list = item.get("links", [])
-                            links_html = ", ".join(
-                                [
-                                    f'<a href="{html_escape(link)}" target="_blank">{html_escape(link)}</a>'
-                                    for link in links_list
-                                ]
-                            )
-                            f.write(
-                                f"<tr><td>{item_id_html}</td><td>{title_html}</td><td>{author_html}</td><td>{desc_html}</td><td>{date_html}</td><td>{court_html}</td><td>{category_html}</td><td>{links_html}</td></tr>\n"
-                            )
-                        f.write("</tbody>\n</table>\n</body>\n</html>")
-                else:
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        for item in self.filtered_data:
-                            f.write(f"№: {item.get('id','N/A')}\n")
-                            f.write(
-                                f"Название материала: {item.get('material_title','Без названия')}\n"
-                            )
-                            f.write(
-                                f"Автор/Издатель: {item.get('author_or_publisher','Неизвестен')}\n"
-                            )
-                            f.write(
-                                f"Описание: {item.get('original_description','')}\n"
-                            )
-                            f.write(
-                                f"Включено: {item.get('entry_date','Неизвестна')}\n"
-                            )
-                            f.write(f"Решение: {item.get('court_name','Неизвестен')}\n")
-                            f.write(f"Категория: {item.get('category','Прочее')}\n")
-                            links = ", ".join(item.get("links", []))
-                            f.write(f"Ссылки: {links}\n")
-                            f.write("-" * 50 + "\n")
-                self.status_label.setText(f"Результаты экспортированы в {file_path}")
-            except Exception as e:
-                self.status_label.setText(f"Ошибка экспорта: {str(e)}")
 
     def show_howto_wtf_dialog(self):
         dialog = QDialog(self)
@@ -1397,7 +1209,7 @@ class ExtrimistMaterialsApp(QMainWindow):
             "background-color: #3c3c3c; color: #e0e0e0; border: 1px solid #505050; padding: 15px; border-radius: 5px;"
         )
         text_browser.setHtml(
-            '\n            <h2 style="color: #d17a3a; text-align: center;">Добро пожаловать в Федеральный список экстремистских материалов</h2>\n            <p>Это приложение позволяет удобно просматривать и искать информацию о материалах, включенных в Федеральный список экстремистских материалов Министерства юстиции Российской Федерации.</p>\n            <p><strong>Основные функции:</strong></p>\n            <ul style="margin-left: 15px;">\n                <li><strong>Загрузка данных:</strong> Автоматическая загрузка актуальных данных с официального сайта МинЮста (сначала RSS, затем попытка CSV через requests, wget/curl). Также возможна загрузка из локального RSS/XML/CSV файла.</li>\n                <li><strong>Поиск:</strong> Быстрый поиск по названию материала, автору, описанию, дате включения, суду или категории. Поиск активируется по нажатию Enter в поле ввода.</li>\n                <li><strong>Фильтр по категориям:</strong> Удобный фильтр по типу материала (например, "Книги/Брошюры", "Аудиозаписи" и т.д.), извлеченному из описания.</li>\n                <li><strong>Сортировка:</strong> Таблица поддерживает сортировку по "№", "Названию материала", "Автору" и "Дате включения" (от новых к старым, от старых к новым) при клике на заголовок столбца.</li>\n                <li><strong>Экспорт:</strong> Экспорт отфильтрованных результатов в текстовый, CSV или HTML-файл.</li>\n                <li><strong>Сохранение данных:</strong> Приложение автоматически сохраняет загруженные данные в файл <code>extremist_materials_data.json</code> для быстрого доступа при следующем запуске, чтобы избежать повторной загрузки из сети.</li>\n                <li><strong>Подробный просмотр:</strong> Выберите строку в таблице и нажмите <strong>Enter</strong> (или дважды кликните мышью), чтобы открыть окно с полной информацией о материале.</li>\n                <li><strong>Изменение ширины столбцов:</strong> Вы можете перетаскивать границы заголовков столбцов в таблице, чтобы изменить их ширину по своему усмотрению. Столбцы будут автоматически масштабироваться, чтобы оставаться в пределах окна.</li>\n            </ul>\n            <p><strong>Что это за софтина?</strong></p>\n            <p>Данное ПО разработано для облегчения доступа к публичной информации, предоставляемой Министерством юстиции РФ, и не является официальным продуктом МинЮста. Все данные берутся из открытых RSS- и CSV-потоков.</p>\n        '
+            '\n            <h2 style="color: #d17a3a; text-align: center;">Добро пожаловать в Федеральный список экстремистских материалов</h2>\n            <p>Это приложение позволяет удобно просматривать и искать информацию о материалах, включенных в Федеральный список экстремистских материалов Министерства юстиции Российской Федерации.</p>\n            <p><strong>Основные функции:</strong></p>\n            <ul style="margin-left: 15px;">\n                <li><strong>Загрузка данных:</strong> Автоматическая загрузка актуальных данных с официального сайта МинЮста (сначала RSS, затем попытка CSV через requests, wget/curl). Также возможна загрузка из локального RSS/XML/CSV файла.</li>\n                <li><strong>Поиск:</strong> Быстрый поиск по названию материала, автору, описанию, дате включения, суду или категории. Результаты обновляются по мере ввода запроса; Enter запускает поиск сразу. Режим «Нечеткий поиск» находит названия и авторов с опечатками и показывает степень сходства, а «По релевантности» разбивает запрос на слова и выводит сначала записи, где они встречаются в названии и авторе. В обоих режимах найденное не означает точного совпадения, поэтому вместо «ЗАПРЕЩЕНО» выводится «ВОЗМОЖНО ЗАПРЕЩЕНО».</li>\n                <li><strong>Расширенный запрос:</strong> Условия можно указать прямо в строке поиска: <code>автор:Иванов название:"..." дата:2020-01-01..2021-12-31 суд:Ленинский -категория:Прочее</code>. Поддерживаются поля title/название, author/автор, description/описание, court/суд, category/категория, id/номер, entry/дата (дата включения) и decision/решение (дата решения); минус перед условием исключает совпадения. Условия по дате, в том числе с минусом, не выбирают записи с неизвестной датой.</li>\n                <li><strong>Фильтр по категориям:</strong> Удобный фильтр по типу материала (например, "Книги/Брошюры", "Аудиозаписи" и т.д.), извлеченному из описания.</li>\n                <li><strong>Сортировка:</strong> Таблица поддерживает сортировку по "№", "Названию материала", "Автору", "Дате решения" и "Дате включения" (от новых к старым, от старых к новым) при клике на заголовок столбца.</li>\n                <li><strong>Экспорт:</strong> Экспорт отфильтрованных результатов в текстовый, CSV, HTML или JSON Lines-файл, в том числе сжатый gzip (.gz). Экспорт идет в фоне и не блокирует окно.</li>\n                <li><strong>Изменения списка:</strong> При каждом обновлении сохраняется предыдущая версия списка. Меню «Данные» → «Изменения после обновления» показывает добавленные и измененные записи, а «Экспорт изменений...» сохраняет отчет (CSV или JSON Lines) с добавленными, измененными и удаленными записями и списком измененных полей.</li>\n                <li><strong>Список отслеживания:</strong> В меню «Данные» → «Список отслеживания...» можно сохранить названия и авторов, за которыми нужно следить. После каждого обновления они проверяются по записям, добавленным с прошлой проверки, а совпадения появляются в панели уведомлений под таблицей; двойной клик открывает запись.</li>\n                <li><strong>Экономичный режим:</strong> Анимация кнопки поиска и статуса останавливается, когда окно свернуто, скрыто или неактивно. В меню «Настройки» → «Экономичный режим анимации» ее можно отключить совсем, что полезно на ноутбуке от батареи; выбор сохраняется между запусками.</li>\n                <li><strong>Сохранение данных:</strong> Приложение автоматически сохраняет загруженные данные в файл <code>extremist_materials_data.json</code> для быстрого доступа при следующем запуске, чтобы избежать повторной загрузки из сети.</li>\n                <li><strong>Подробный просмотр:</strong> Выберите строку в таблице и нажмите <strong>Enter</strong> (или дважды кликните мышью), чтобы открыть окно с полной информацией о материале. Окно не блокирует таблицу; стрелки вверх и вниз переключают его на предыдущую и следующую запись результатов.</li>\n                <li><strong>Изменение ширины столбцов:</strong> Вы можете перетаскивать границы заголовков столбцов в таблице, чтобы изменить их ширину по своему усмотрению. Столбцы будут автоматически масштабироваться, чтобы оставаться в пределах окна.</li>\n            </ul>\n            <p><strong>Что это за софтина?</strong></p>\n            <p>Данное ПО разработано для облегчения доступа к публичной информации, предоставляемой Министерством юстиции РФ, и не является официальным продуктом МинЮста. Все данные берутся из открытых RSS- и CSV-потоков.</p>\n        '
         )
         layout.addWidget(text_browser)
         close_button = QPushButton("Закрыть")
@@ -1455,6 +1267,7 @@ class ExtrimistMaterialsApp(QMainWindow):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = ExtrimistMaterialsApp()
     window.show()
@@ -0,0 +1,273 @@
+import sys, argparse, json, multiprocessing
+from justice4all_core import (
+    RecordStore,
+    Watchlist,
+    refresh_store,
+    BatchMatcher,
+    SEARCH_CRITERIA_FIELDS,
+    SCORED_CRITERIA,
+    QuerySyntaxError,
+    iter_batch_queries,
+    write_batch_report,
+    write_diff_report,
+    export_to_path,
+    export_diff_to_path,
+)
+from justice4all_server import serve
+
+SEARCH_CRITERIA = (
+    ["Все поля", "Номер"]
+    + [criteria for criteria in SEARCH_CRITERIA_FIELDS if criteria != "Все поля"]
+    + SCORED_CRITERIA
+)
+
+
+def report(message):
+    print(message, file=sys.stderr)
+
+
+def open_store(args):
+    store = RecordStore(args.data_dir)
+    if not store.load():
+        report("Нет сохраненных данных. Сначала выполните: justice4all refresh")
+        sys.exit(2)
+    return store
+
+
+def write_records(records, output_format, scores=None):
+    for (i, record) in enumerate(records):
+        if output_format == "json":
+            if scores is not None:
+                record = dict(record, score=round(scores[i], 3))
+            line = json.dumps(record, ensure_ascii=False)
+        else:
+            columns = [
+                record.get("id", ""),
+                record.get("entry_date", ""),
+                record.get("category", ""),
+                record.get("material_title", ""),
+            ]
+            if scores is not None:
+                columns.insert(1, f"{scores[i]:.2f}")
+            line = "\t".join(columns)
+        print(line)
+
+
+def command_search(args):
+    store = open_store(args)
+    scores = None
+    if args.by in SCORED_CRITERIA:
+        matches = store.scored_matches(args.query, args.by, args.category)
+        rows = [row for (row, _) in matches]
+        scores = [score for (_, score) in matches]
+    else:
+        try:
+            rows = store.search(args.query, args.by, args.category)
+        except QuerySyntaxError as e:
+            report(f"Ошибка в запросе: {str(e)}")
+            return 2
+    if args.limit:
+        rows = rows[: args.limit]
+    if args.output:
+        export_to_path(args.output, store.data, rows)
+        report(f"Экспортировано записей: {len(rows)}.")
+        return 0 if rows else 1
+    write_records((store.record(row) for row in rows), args.format, scores)
+    return 0 if rows else 1
+
+
+def write_alerts(alerts):
+    for alert in alerts:
+        print(
+            "\t".join(
+                [
+                    alert["query"],
+                    alert["id"],
+                    ", ".join(alert["fields"]),
+                    alert["material_title"],
+                ]
+            )
+        )
+
+
+def command_refresh(args):
+    store = RecordStore(args.data_dir)
+    try:
+        store.load()
+    except Exception as e:
+        report(f"Ошибка загрузки сохраненных данных: {str(e)}")
+    try:
+        print(refresh_store(store, args.full, progress=report))
+    except Exception as e:
+        report(str(e))
+        return 2
+    watchlist = Watchlist(store.watchlist_path).load()
+    alerts = watchlist.screen(store)
+    if alerts:
+        report(f"Совпадения по списку отслеживания: {len(alerts)}.")
+        write_alerts(alerts)
+    return 0
+
+
+def command_watch(args):
+    store = open_store(args)
+    watchlist = Watchlist(store.watchlist_path).load()
+    if args.action == "add":
+        watchlist.update(watchlist.queries + args.queries, store)
+    elif args.action == "remove":
+        removed = set(args.queries)
+        queries = [query for query in watchlist.queries if query not in removed]
+        watchlist.update(queries, store)
+    elif args.action == "alerts":
+        write_alerts(watchlist.alerts)
+        return 0 if watchlist.alerts else 1
+    elif args.action == "clear":
+        watchlist.clear_alerts()
+        return 0
+    for query in watchlist.queries:
+        print(query)
+    return 0
+
+
+def command_check(args):
+    store = open_store(args)
+    fields = SEARCH_CRITERIA_FIELDS[args.by]
+    column = args.column - 1 if args.column else None
+    path = sys.stdin.fileno() if args.file == "-" else args.file
+    with open(path, "r", encoding="utf-8-sig", closefd=args.file != "-") as f:
+        matcher = BatchMatcher(iter_batch_queries(f, column, args.delimiter))
+    hits = matcher.run(store, fields)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            matched = write_batch_report(f, matcher, hits, store, args.format)
+    else:
+        matched = write_batch_report(sys.stdout, matcher, hits, store, args.format)
+    report(f"Проверено запросов: {len(matcher)}, найдены совпадения: {matched}.")
+    return 0 if matched else 1
+
+
+def command_diff(args):
+    store = open_store(args)
+    diff = store.changes()
+    if diff is None:
+        report("Предыдущая версия списка не сохранена. Она появится после refresh.")
+        return 2
+    if args.output:
+        export_diff_to_path(args.output, diff, store.data)
+    else:
+        write_diff_report(sys.stdout, diff, store.data, args.format)
+    report(
+        f"Добавлено записей: {len(diff.added)}, изменено: {len(diff.modified)}, удалено: {len(diff.removed)}."
+    )
+    return 0 if len(diff) else 1
+
+
+def command_serve(args):
+    report(f"HTTP-сервер запущен на http://{args.host}:{args.port}/")
+    serve(args.data_dir, args.host, args.port, args.workers, args.reload_interval)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="justice4all",
+        description="Поиск по Федеральному списку экстремистских материалов без графического интерфейса.",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default="",
+        help="каталог с сохраненными данными (по умолчанию текущий)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    search_parser = subparsers.add_parser("search", help="найти материалы по запросу")
+    search_parser.add_argument("query", help="поисковый запрос")
+    search_parser.add_argument(
+        "--by", choices=SEARCH_CRITERIA, default="Все поля", help="где искать"
+    )
+    search_parser.add_argument(
+        "--category", default="Все категории", help="фильтр по категории"
+    )
+    search_parser.add_argument(
+        "--limit", type=int, default=0, help="вывести не больше N записей"
+    )
+    search_parser.add_argument("--format", choices=["text", "json"], default="text")
+    search_parser.add_argument(
+        "--output",
+        help="экспортировать найденное в файл (.txt, .csv, .html, .jsonl, можно с .gz)",
+    )
+    search_parser.set_defaults(handler=command_search)
+    refresh_parser = subparsers.add_parser(
+        "refresh", help="обновить данные с сайта МинЮста"
+    )
+    refresh_parser.add_argument(
+        "--full", action="store_true", help="заново скачать весь список"
+    )
+    refresh_parser.set_defaults(handler=command_refresh)
+    check_parser = subparsers.add_parser(
+        "check", help="проверить каждую строку файла по списку"
+    )
+    check_parser.add_argument(
+        "file", help="файл с запросами по одному на строку (- для stdin)"
+    )
+    check_parser.add_argument(
+        "--by",
+        choices=list(SEARCH_CRITERIA_FIELDS),
+        default="Все поля",
+        help="где искать",
+    )
+    check_parser.add_argument(
+        "--column", type=int, default=0, help="взять запросы из N-го столбца CSV"
+    )
+    check_parser.add_argument(
+        "--delimiter", default=";", help="разделитель столбцов CSV (по умолчанию ;)"
+    )
+    check_parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    check_parser.add_argument("--output", help="записать отчет в файл")
+    check_parser.set_defaults(handler=command_check)
+    diff_parser = subparsers.add_parser(
+        "diff", help="показать изменения списка после последнего обновления"
+    )
+    diff_parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    diff_parser.add_argument(
+        "--output", help="записать отчет в файл (.csv или .jsonl, можно с .gz)"
+    )
+    diff_parser.set_defaults(handler=command_diff)
+    watch_parser = subparsers.add_parser(
+        "watch", help="список отслеживания новых записей"
+    )
+    watch_parser.add_argument(
+        "action",
+        choices=["list", "add", "remove", "alerts", "clear"],
+        help="показать, добавить или удалить запросы; показать или очистить уведомления",
+    )
+    watch_parser.add_argument("queries", nargs="*", help="названия или авторы")
+    watch_parser.set_defaults(handler=command_watch)
+    serve_parser = subparsers.add_parser(
+        "serve", help="запустить HTTP/JSON-сервис поиска"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="число потоков для пакетных проверок и обновления",
+    )
+    serve_parser.add_argument(
+        "--reload-interval",
+        type=int,
+        default=30,
+        help="как часто (в секундах) проверять, не обновились ли данные на диске",
+    )
+    serve_parser.set_defaults(handler=command_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,2766 @@
+import sys, requests
+from bs4 import BeautifulSoup
+from lxml import etree
+import warnings, re, os, json, csv, datetime, subprocess, platform, struct, zlib, mmap
+import hashlib, codecs, itertools, multiprocessing, html, unicodedata, math, heapq
+import gzip, functools, threading
+from collections import deque, OrderedDict, Counter
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO, BytesIO
+from array import array
+
+warnings.filterwarnings(
+    "ignore", category=requests.packages.urllib3.exceptions.InsecureRequestWarning
+)
+DATA_FILE_PATH = "extremist_materials_data.json"
+SNAPSHOT_FILE_PATH = "extremist_materials_data.snapshot"
+PREVIOUS_SNAPSHOT_FILE_PATH = "extremist_materials_data.previous.snapshot"
+PREVIOUS_ROWS_FILE_PATH = "extremist_materials_data.previous.json"
+DELTA_FILE_PATH = "extremist_materials_data.delta"
+DELTA_COMPACT_SIZE = 1024 * 1024
+HTTP_CACHE_FILE_PATH = "extremist_materials_http_cache.json"
+WATCHLIST_FILE_PATH = "extremist_materials_watchlist.json"
+CSV_URL = "https://minjust.gov.ru/uploaded/files/exportfsm.csv"
+RSS_URL = "https://minjust.gov.ru/ru/subscription/rss/extremist_materials/"
+ENCODINGS_TO_TRY = ["utf-8", "windows-1251", "cp1251", "latin-1", "cp866"]
+ENCODING_SNIFF_SIZE = 65536
+STREAM_CHUNK_SIZE = 65536
+PARSE_WORKERS = int(os.environ.get("JUSTICE4ALL_PARSE_WORKERS", "0")) or min(
+    4, os.cpu_count() or 1
+)
+PARSE_CHUNK_SIZE = 500
+PARALLEL_MIN_ITEMS = 20000
+SEARCH_CACHE_SIZE = 64
+SEARCH_NARROW_MAX_ROWS = 500
+TEXT_FIELDS = [
+    "material_title",
+    "author",
+    "description",
+    "date",
+    "court",
+    "category",
+    "file_info",
+]
+TRANSLIT_FIELDS = {
+    "material_title": "material_title_translit",
+    "author": "author_translit",
+}
+INDEX_FIELDS = TEXT_FIELDS + list(TRANSLIT_FIELDS.values())
+RECORD_FIELDS = [
+    "id",
+    "material_title",
+    "author_or_publisher",
+    "description",
+    "original_description",
+    "entry_date",
+    "links",
+    "court_decision",
+    "decision_date",
+    "court_name",
+    "category",
+    "file_info",
+]
+STORED_FIELDS = [field for field in RECORD_FIELDS if field != "description"]
+INTERNED_FIELDS = [
+    "author_or_publisher",
+    "entry_date",
+    "court_decision",
+    "decision_date",
+    "court_name",
+    "category",
+    "file_info",
+]
+INTERNED_INDEX_FIELDS = ["author", "date", "court", "category", "file_info"]
+DESCRIPTION_PREVIEW_SIZE = 200
+TYPED_FIELDS = ["id", "entry_date", "decision_date"]
+SORT_FIELDS = TYPED_FIELDS + ["material_title", "author_or_publisher"]
+MISSING_ID = 0xFFFFFFFF
+SNAPSHOT_MAGIC = b"J4AS"
+SNAPSHOT_VERSION = 6
+SNAPSHOT_HEADER = struct.Struct("<4sHIIQI")
+SNAPSHOT_SCHEMA = zlib.crc32(
+    "|".join(STORED_FIELDS + INDEX_FIELDS + TYPED_FIELDS).encode("utf-8")
+)
+NORMALIZE_TABLE = str.maketrans(
+    {
+        "ё": "е",
+        "«": '"',
+        "»": '"',
+        "„": '"',
+        "“": '"',
+        "”": '"',
+        "‟": '"',
+        "″": '"',
+        "‘": "'",
+        "’": "'",
+        "‚": "'",
+        "‛": "'",
+        "′": "'",
+        "‐": "-",
+        "‑": "-",
+        "‒": "-",
+        "–": "-",
+        "—": "-",
+        "―": "-",
+        "−": "-",
+        "\u00ad": None,
+    }
+)
+WHITESPACE_PATTERN = re.compile("\\s+")
+TRANSLIT_TABLE = str.maketrans(
+    {
+        "а": "a",
+        "б": "b",
+        "в": "v",
+        "г": "g",
+        "д": "d",
+        "е": "e",
+        "ж": "zh",
+        "з": "z",
+        "и": "i",
+        "й": "i",
+        "к": "k",
+        "л": "l",
+        "м": "m",
+        "н": "n",
+        "о": "o",
+        "п": "p",
+        "р": "r",
+        "с": "s",
+        "т": "t",
+        "у": "u",
+        "ф": "f",
+        "х": "kh",
+        "ц": "ts",
+        "ч": "ch",
+        "ш": "sh",
+        "щ": "shch",
+        "ъ": "ie",
+        "ы": "y",
+        "ь": "",
+        "э": "e",
+        "ю": "iu",
+        "я": "ia",
+    }
+)
+LATIN_FOLDS = [
+    ("yo", "e"),
+    ("jo", "e"),
+    ("ye", "e"),
+    ("je", "e"),
+    ("yu", "iu"),
+    ("ju", "iu"),
+    ("ya", "ia"),
+    ("ja", "ia"),
+    ("kh", "h"),
+    ("ph", "f"),
+    ("ck", "k"),
+    ("tz", "ts"),
+    ("x", "ks"),
+    ("w", "v"),
+    ("q", "k"),
+    ("y", "i"),
+    ("j", "i"),
+    ("ii", "i"),
+]
+FUZZY_CRITERIA = "Нечеткий поиск"
+FUZZY_FIELDS = ["material_title", "author"] + list(TRANSLIT_FIELDS.values())
+FUZZY_TOKEN_PATTERN = re.compile("\\w{3,}")
+FUZZY_TOKEN_SIMILARITY = 0.45
+FUZZY_MIN_SCORE = 0.5
+FUZZY_MIN_SHARED_GRAMS = 2
+FUZZY_MAX_EDITS = 2
+FUZZY_MAX_RESULTS = 200
+RANKED_CRITERIA = "По релевантности"
+RANK_FIELD_WEIGHTS = {
+    "material_title": 3.0,
+    "material_title_translit": 3.0,
+    "author": 2.0,
+    "author_translit": 2.0,
+    "description": 1.0,
+    "court": 0.5,
+}
+RANK_TOKEN_PATTERN = re.compile("\\w+")
+RANK_K1 = 1.2
+RANK_B = 0.75
+RANKED_MAX_RESULTS = 100
+SCORED_CRITERIA = [FUZZY_CRITERIA, RANKED_CRITERIA]
+QUERY_FIELD_ALIASES = {
+    "title": "material_title",
+    "название": "material_title",
+    "author": "author",
+    "автор": "author",
+    "description": "description",
+    "desc": "description",
+    "описание": "description",
+    "court": "court",
+    "суд": "court",
+    "category": "category",
+    "категория": "category",
+    "id": "id",
+    "номер": "id",
+    "entry": "entry_date",
+    "date": "entry_date",
+    "дата": "entry_date",
+    "decision": "decision_date",
+    "решение": "decision_date",
+}
+QUERY_DATE_FIELDS = ["entry_date", "decision_date"]
+QUERY_TERM_PATTERN = re.compile('(-?)(?:(\\w+):)?(?:"([^"]*)"?|([^\\s"]+))')
+QUERY_DATE_PATTERNS = [
+    re.compile("(\\d{1,2})\\.(\\d{1,2})\\.(\\d{4})$"),
+    re.compile("(\\d{4})-(\\d{1,2})-(\\d{1,2})$"),
+    re.compile("(\\d{1,2})\\.(\\d{4})$"),
+    re.compile("(\\d{4})-(\\d{1,2})$"),
+    re.compile("(\\d{4})$"),
+]
+RECORD_DATE_PATTERN = re.compile("(\\d{2})\\.(\\d{2})\\.(\\d{4})")
+LATIN_QUERY_PATTERN = re.compile("[a-z]")
+CYRILLIC_PATTERN = re.compile("[а-я]")
+SEARCH_CRITERIA_FIELDS = {
+    "Все поля": TEXT_FIELDS,
+    "Название материала": ["material_title"],
+    "Автор": ["author"],
+    "Описание": ["description"],
+    "Дата включения": ["date"],
+    "Суд": ["court"],
+    "Категория": ["category"],
+}
+
+
+class PackedPostings:
+    def __init__(self, grams, offsets, flat):
+        self.slots = dict(zip(grams, range(len(grams))))
+        self.offsets = offsets
+        self.flat = flat
+        self.extra = {}
+
+    @classmethod
+    def from_snapshot(cls, grams, offsets, flat):
+        return cls(decode_snapshot_strings(*grams), offsets, flat)
+
+    def get(self, gram, default=None):
+        slot = self.slots.get(gram)
+        extra = self.extra.get(gram)
+        if slot is None:
+            return default if extra is None else extra
+        posting = self.flat[self.offsets[slot] : self.offsets[slot + 1]]
+        return posting if extra is None else array("I", posting) + extra
+
+    def append(self, gram, row):
+        posting = self.extra.get(gram)
+        if posting is None:
+            posting = self.extra[gram] = array("I")
+        posting.append(row)
+
+    def items(self):
+        for gram in self.slots:
+            yield (gram, self.get(gram))
+        for (gram, posting) in self.extra.items():
+            if gram not in self.slots:
+                yield (gram, posting)
+
+
+class TrigramIndex:
+    def __init__(self, data=None, index=None):
+        self.columns = {}
+        self.postings = {}
+        self.ids = {}
+        if data is not None and index is not None:
+            self.build(data, index)
+
+    def build(self, data, index):
+        self.columns = {field: index.setdefault(field, []) for field in INDEX_FIELDS}
+        self.postings = {field: {} for field in INDEX_FIELDS}
+        self.ids = {}
+        self.extend(data, 0)
+
+    def extend(self, data, start):
+        for field in INDEX_FIELDS:
+            column = self.columns[field]
+            postings = self.postings[field]
+            packed = isinstance(postings, PackedPostings)
+            for i in range(start, len(column)):
+                for gram in self.trigrams(column[i]):
+                    if packed:
+                        postings.append(gram, i)
+                        continue
+                    posting = postings.get(gram)
+                    if posting is None:
+                        posting = postings[gram] = array("I")
+                    posting.append(i)
+        for i in range(start, len(data)):
+            self.ids.setdefault(data[i].get("id"), []).append(i)
+
+    @classmethod
+    def from_packed(cls, ids, index, packed):
+        search_index = cls()
+        search_index.columns = index
+        search_index.postings = packed
+        for (i, item_id) in enumerate(ids):
+            search_index.ids.setdefault(item_id, []).append(i)
+        return search_index
+
+    def pack_postings(self, field):
+        grams = []
+        offsets = array("I", [0])
+        flat = array("I")
+        for (gram, posting) in self.postings.get(field, {}).items():
+            grams.append(gram)
+            flat.frombytes(posting.tobytes())
+            offsets.append(len(flat))
+        return (grams, offsets, flat)
+
+    @staticmethod
+    def trigrams(text):
+        return {text[j : j + 3] for j in range(len(text) - 2)}
+
+    def lookup_id(self, query):
+        return list(self.ids.get(query, []))
+
+    def search(self, query, fields):
+        rows = set()
+        for field in fields:
+            rows.update(self.search_field(query, field))
+        return sorted(rows)
+
+    def search_targets(self, targets):
+        rows = set()
+        for (field, query) in targets:
+            rows.update(self.search_field(query, field))
+        return sorted(rows)
+
+    def estimate(self, query, field):
+        column = self.columns.get(field, [])
+        if len(query) < 3:
+            return len(column)
+        postings = self.postings.get(field, {})
+        return min(len(postings.get(gram, ())) for gram in self.trigrams(query))
+
+    def search_field(self, query, field):
+        column = self.columns.get(field, [])
+        if len(query) < 3:
+            return [i for (i, text) in enumerate(column) if query in text]
+        postings = self.postings.get(field, {})
+        lists = []
+        for gram in self.trigrams(query):
+            posting = postings.get(gram)
+            if posting is None:
+                return []
+            lists.append(posting)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for posting in lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return [i for i in candidates if query in column[i]]
+
+
+def bounded_edit_distance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for (i, char) in enumerate(a, 1):
+        current = [i]
+        for (j, other) in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char != other),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    def __init__(self, index):
+        self.tokens = {}
+        self.token_texts = []
+        self.token_sizes = []
+        self.token_rows = []
+        self.gram_tokens = {}
+        self.extend(index, 0)
+
+    def extend(self, index, start):
+        columns = [index[field] for field in FUZZY_FIELDS]
+        for row in range(start, len(columns[0])):
+            tokens = set()
+            for column in columns:
+                tokens.update(FUZZY_TOKEN_PATTERN.findall(column[row]))
+            for token in tokens:
+                token_id = self.tokens.get(token)
+                if token_id is None:
+                    token_id = self.add_token(token)
+                self.token_rows[token_id].append(row)
+
+    def add_token(self, token):
+        token_id = self.tokens[token] = len(self.token_rows)
+        grams = self.grams(token)
+        self.token_texts.append(token)
+        self.token_sizes.append(len(grams))
+        self.token_rows.append(array("I"))
+        for gram in grams:
+            posting = self.gram_tokens.get(gram)
+            if posting is None:
+                posting = self.gram_tokens[gram] = array("I")
+            posting.append(token_id)
+        return token_id
+
+    @staticmethod
+    def grams(token):
+        return TrigramIndex.trigrams("  " + token + " ")
+
+    def similar_tokens(self, token):
+        grams = self.grams(token)
+        shared = {}
+        for gram in grams:
+            for token_id in self.gram_tokens.get(gram, ()):
+                shared[token_id] = shared.get(token_id, 0) + 1
+        similar = {}
+        for (token_id, count) in shared.items():
+            if count < FUZZY_MIN_SHARED_GRAMS:
+                continue
+            similarity = 2 * count / (len(grams) + self.token_sizes[token_id])
+            if similarity < FUZZY_TOKEN_SIMILARITY:
+                similarity = self.edit_similarity(token, self.token_texts[token_id])
+            if similarity >= FUZZY_TOKEN_SIMILARITY:
+                similar[token_id] = similarity
+        return similar
+
+    @staticmethod
+    def edit_similarity(token, other):
+        limit = min(FUZZY_MAX_EDITS, len(token) // 3)
+        distance = bounded_edit_distance(token, other, limit)
+        if distance > limit:
+            return 0
+        return 1 - distance / max(len(token), len(other))
+
+    def search(self, query):
+        tokens = FUZZY_TOKEN_PATTERN.findall(query)
+        scores = {}
+        for token in tokens:
+            best = {}
+            for (token_id, similarity) in self.similar_tokens(token).items():
+                for row in self.token_rows[token_id]:
+                    if best.get(row, 0) < similarity:
+                        best[row] = similarity
+            for (row, similarity) in best.items():
+                scores[row] = scores.get(row, 0) + similarity
+        matches = [
+            (row, score / len(tokens))
+            for (row, score) in scores.items()
+            if score >= FUZZY_MIN_SCORE * len(tokens)
+        ]
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+
+class RankedIndex:
+    def __init__(self, index):
+        count = len(index["material_title"])
+        weighted = {}
+        for (field, weight) in RANK_FIELD_WEIGHTS.items():
+            tokens = [RANK_TOKEN_PATTERN.findall(text) for text in index[field]]
+            average = sum(map(len, tokens)) / count if count else 0
+            for (row, row_tokens) in enumerate(tokens):
+                if not row_tokens:
+                    continue
+                norm = weight / (1 - RANK_B + RANK_B * len(row_tokens) / average)
+                for (term, frequency) in Counter(row_tokens).items():
+                    postings = weighted.get(term)
+                    if postings is None:
+                        postings = weighted[term] = {}
+                    postings[row] = postings.get(row, 0) + frequency * norm
+        self.postings = {}
+        for (term, postings) in weighted.items():
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            self.postings[term] = (
+                array("I", postings),
+                array(
+                    "d",
+                    [
+                        idf * tf * (RANK_K1 + 1) / (RANK_K1 + tf)
+                        for tf in postings.values()
+                    ],
+                ),
+            )
+
+    def search(self, terms, limit, accept=None):
+        scores = {}
+        for term in terms:
+            (rows, contributions) = self.postings.get(term, ((), ()))
+            for (row, contribution) in zip(rows, contributions):
+                scores[row] = scores.get(row, 0) + contribution
+        matches = scores.items()
+        if accept is not None:
+            matches = ((row, score) for (row, score) in matches if accept(row))
+        return heapq.nlargest(limit, matches, key=lambda match: (match[1], -match[0]))
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+def record_date_key(text):
+    match = RECORD_DATE_PATTERN.search(text or "")
+    if match is None:
+        return 0
+    (day, month, year) = match.groups()
+    return int(year) * 10000 + int(month) * 100 + int(day)
+
+
+def record_id_key(text):
+    return int(text) if text.isdigit() and len(text) < 10 else MISSING_ID
+
+
+def typed_column(values, field):
+    if field == "id":
+        return array("I", [record_id_key(str(value)) for value in values])
+    return array("I", [record_date_key(value) for value in values])
+
+
+def query_date_bounds(text):
+    for (kind, pattern) in enumerate(QUERY_DATE_PATTERNS):
+        match = pattern.match(text)
+        if match is None:
+            continue
+        parts = [int(part) for part in match.groups()]
+        (month, day) = (None, None)
+        if kind == 0:
+            (day, month, year) = parts
+        elif kind == 1:
+            (year, month, day) = parts
+        elif kind == 2:
+            (month, year) = parts
+        elif kind == 3:
+            (year, month) = parts
+        else:
+            (year,) = parts
+        try:
+            datetime.date(
+                year, 1 if month is None else month, 1 if day is None else day
+            )
+        except ValueError:
+            raise QuerySyntaxError(f"Несуществующая дата: {text}")
+        if month is None:
+            return (year * 10000, year * 10000 + 9999)
+        key = year * 10000 + month * 100
+        if day is None:
+            return (key, key + 99)
+        return (key + day, key + day)
+    raise QuerySyntaxError(f"Не удалось разобрать дату: {text}")
+
+
+def query_date_range(text):
+    if ".." not in text:
+        return query_date_bounds(text)
+    (start, _, end) = text.partition("..")
+    low = query_date_bounds(start)[0] if start else 1
+    high = query_date_bounds(end)[1] if end else 99999999
+    return (low, high)
+
+
+class QueryPlan:
+    def __init__(self, predicates):
+        self.predicates = predicates
+
+    def estimate(self, store, predicate):
+        (negated, kind, targets) = predicate
+        if kind == "id":
+            return len(store.search_index.ids.get(targets, ()))
+        if kind == "date":
+            return len(store)
+        return sum(
+            store.search_index.estimate(value, field) for (field, value) in targets
+        )
+
+    def matches(self, store, predicate, row):
+        (negated, kind, targets) = predicate
+        if kind == "id":
+            found = store.data.columns["id"][row] == targets
+        elif kind == "date":
+            (field, low, high) = targets
+            value = store.typed_columns[field][row]
+            if not value:
+                return False
+            found = low <= value <= high
+        else:
+            columns = store.search_index.columns
+            found = any(value in columns[field][row] for (field, value) in targets)
+        return found != negated
+
+    def seed(self, store, predicate):
+        (negated, kind, targets) = predicate
+        if kind == "id":
+            return store.search_index.lookup_id(targets)
+        return store.search_index.search_targets(targets)
+
+    def execute(self, store):
+        order = sorted(
+            self.predicates,
+            key=lambda predicate: (predicate[0], self.estimate(store, predicate)),
+        )
+        seed = next(
+            (
+                predicate
+                for predicate in order
+                if not predicate[0] and predicate[1] != "date"
+            ),
+            None,
+        )
+        if seed is None:
+            rows = range(len(store))
+        else:
+            rows = self.seed(store, seed)
+            order.remove(seed)
+        for predicate in order:
+            rows = [row for row in rows if self.matches(store, predicate, row)]
+        return list(rows)
+
+
+def compile_query(query, criteria="Все поля"):
+    terms = list(QUERY_TERM_PATTERN.finditer(query))
+    if not any(QUERY_FIELD_ALIASES.get(term.group(2)) for term in terms):
+        return None
+    predicates = []
+    for term in terms:
+        (minus, name, quoted, word) = term.groups()
+        field = QUERY_FIELD_ALIASES.get(name)
+        value = quoted if quoted is not None else word
+        if name is not None and field is None:
+            value = term.group(0)[len(minus) :]
+        if not value:
+            continue
+        negated = bool(minus)
+        if field in QUERY_DATE_FIELDS:
+            (low, high) = query_date_range(value)
+            predicates.append((negated, "date", (field, low, high)))
+        elif field == "id" or (field is None and criteria == "Номер"):
+            predicates.append((negated, "id", value))
+        else:
+            fields = (
+                [field] if field else SEARCH_CRITERIA_FIELDS.get(criteria, TEXT_FIELDS)
+            )
+            predicates.append((negated, "text", search_targets(value, fields)))
+    return QueryPlan(predicates)
+
+
+def preview_description(text):
+    if len(text) > DESCRIPTION_PREVIEW_SIZE:
+        return text[:DESCRIPTION_PREVIEW_SIZE] + "..."
+    return text
+
+
+class RecordView(Mapping):
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, field):
+        return self.table.value(self.row, field)
+
+    def __iter__(self):
+        return iter(RECORD_FIELDS)
+
+    def __len__(self):
+        return len(RECORD_FIELDS)
+
+
+def record_content_hash(record):
+    values = []
+    for field in RECORD_FIELDS:
+        if field == "links":
+            values.append("\n".join(record.get(field, ())))
+        else:
+            values.append(str(record.get(field, "")))
+    text = "\x1f".join(values)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RecordTable:
+    def __init__(self, records=()):
+        self.columns = {field: [] for field in STORED_FIELDS}
+        self.description_ends = array("B")
+        self.description_overrides = {}
+        self.hashes = array("Q")
+        for record in records:
+            self.append(record)
+
+    @classmethod
+    def from_columns(cls, columns, description_ends, description_overrides, hashes):
+        table = cls()
+        table.columns = columns
+        table.description_ends = description_ends
+        table.description_overrides = description_overrides
+        table.hashes = hashes
+        return table
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [RecordView(self, i) for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return RecordView(self, row)
+
+    def __iter__(self):
+        return (RecordView(self, row) for row in range(len(self)))
+
+    def value(self, row, field):
+        if field == "description":
+            override = self.description_overrides.get(row)
+            if override is not None:
+                return override
+            end = self.description_ends[row]
+            return preview_description(self.columns["original_description"][row][:end])
+        if field == "links":
+            return list(self.columns["links"][row])
+        if field not in self.columns:
+            raise KeyError(field)
+        return self.columns[field][row]
+
+    def append(self, record):
+        row = len(self)
+        for field in STORED_FIELDS:
+            value = record.get(field, "")
+            if field == "links":
+                value = tuple(value)
+            elif field in INTERNED_FIELDS:
+                value = sys.intern(str(value))
+            self.columns[field].append(value)
+        description = record.get("description", "")
+        original = record.get("original_description", "")
+        end = min(len(description), DESCRIPTION_PREVIEW_SIZE + 1)
+        if description.endswith("...") and len(description) > DESCRIPTION_PREVIEW_SIZE:
+            end = DESCRIPTION_PREVIEW_SIZE + 1
+        if preview_description(original[:end]) != description:
+            self.description_overrides[row] = description
+            end = 0
+        self.description_ends.append(end)
+        self.hashes.append(record_content_hash(record))
+
+
+class RecordDiff:
+    def __init__(self, added, removed, modified):
+        self.added = added
+        self.removed = removed
+        self.modified = modified
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.modified)
+
+    def changed_rows(self):
+        return self.added + [row for (row, _, _) in self.modified]
+
+
+def diff_tables(old, new):
+    old_rows = {item_id: row for (row, item_id) in enumerate(old.columns["id"])}
+    (added, modified, kept) = ([], [], set())
+    for (row, item_id) in enumerate(new.columns["id"]):
+        old_row = old_rows.get(item_id)
+        if old_row is None:
+            added.append(row)
+            continue
+        kept.add(item_id)
+        if old.hashes[old_row] == new.hashes[row]:
+            continue
+        (before, after) = (old[old_row], new[row])
+        fields = [field for field in RECORD_FIELDS if before[field] != after[field]]
+        modified.append((row, before, fields))
+    removed = [old[row] for (item_id, row) in old_rows.items() if item_id not in kept]
+    return RecordDiff(added, removed, modified)
+
+
+def pack_snapshot_strings(values):
+    blob = "\0".join(value.replace("\0", "") for value in values).encode(
+        "utf-16-le"
+    )
+    return struct.pack("<IQ", len(values), len(blob)) + blob
+
+
+def pack_snapshot_ints(values):
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return struct.pack("<Q", len(values)) + values.tobytes()
+
+
+def decode_snapshot_strings(blob, count, convert=None):
+    values = str(blob, "utf-16-le").split("\0") if count else []
+    if len(values) != count:
+        raise ValueError("The snapshot string table is damaged.")
+    if convert is not None:
+        values = list(map(convert, values))
+    return values
+
+
+def snapshot_links(value):
+    return tuple(value.split("\n")) if value else ()
+
+
+class SnapshotColumns(MutableMapping):
+    def __init__(self, loaders):
+        self.columns = {}
+        self.loaders = loaders
+        self.lock = threading.Lock()
+
+    def __getitem__(self, field):
+        if field not in self.columns:
+            with self.lock:
+                if field not in self.columns:
+                    self.columns[field] = self.loaders.pop(field)()
+        return self.columns[field]
+
+    def __setitem__(self, field, value):
+        with self.lock:
+            self.loaders.pop(field, None)
+            self.columns[field] = value
+
+    def __delitem__(self, field):
+        with self.lock:
+            if self.loaders.pop(field, None) is None:
+                del self.columns[field]
+
+    def __contains__(self, field):
+        return field in self.columns or field in self.loaders
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.columns) + list(self.loaders))
+
+    def __len__(self):
+        return len(self.columns) + len(self.loaders)
+
+
+def snapshot_string_columns(tables, interned=()):
+    loaders = {}
+    for (field, (blob, count)) in tables.items():
+        convert = sys.intern if field in interned else None
+        if field == "links":
+            convert = snapshot_links
+        loaders[field] = functools.partial(
+            decode_snapshot_strings, blob, count, convert
+        )
+    return SnapshotColumns(loaders)
+
+
+class SnapshotReader:
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.pos = 0
+        self.sections = None
+
+    def advance(self, size):
+        self.pos += size
+        if self.sections is not None and next(self.sections, None) != self.pos:
+            raise ValueError("The snapshot layout is damaged.")
+
+    def string_table(self):
+        (count, size) = struct.unpack_from("<IQ", self.buffer, self.pos)
+        blob = self.buffer[self.pos + 12 : self.pos + 12 + size]
+        self.advance(12 + size)
+        return (blob, count)
+
+    def strings(self):
+        return decode_snapshot_strings(*self.string_table())
+
+    def ints(self, typecode="I"):
+        (count,) = struct.unpack_from("<Q", self.buffer, self.pos)
+        values = array(typecode)
+        size = values.itemsize * count
+        values.frombytes(self.buffer[self.pos + 8 : self.pos + 8 + size])
+        self.advance(8 + size)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def view(self, typecode="I"):
+        if sys.byteorder != "little":
+            return self.ints(typecode)
+        (count,) = struct.unpack_from("<Q", self.buffer, self.pos)
+        size = array(typecode).itemsize * count
+        values = self.buffer[self.pos + 8 : self.pos + 8 + size].cast(typecode)
+        self.advance(8 + size)
+        return values
+
+
+def write_snapshot(path, data, index, search_index, typed_columns):
+    parts = []
+    for field in STORED_FIELDS:
+        values = data.columns[field]
+        if field == "links":
+            values = ["\n".join(links) for links in values]
+        parts.append(pack_snapshot_strings(values))
+    parts.append(pack_snapshot_ints(array("I", data.description_ends)))
+    overrides = sorted(data.description_overrides.items())
+    parts.append(pack_snapshot_ints(array("I", [row for (row, _) in overrides])))
+    parts.append(pack_snapshot_strings([text for (_, text) in overrides]))
+    parts.append(pack_snapshot_ints(data.hashes))
+    for field in INDEX_FIELDS:
+        parts.append(pack_snapshot_strings(index[field]))
+    for field in INDEX_FIELDS:
+        (grams, offsets, flat) = search_index.pack_postings(field)
+        parts.append(pack_snapshot_strings(grams))
+        parts.append(pack_snapshot_ints(offsets))
+        parts.append(pack_snapshot_ints(flat))
+    for field in TYPED_FIELDS:
+        parts.append(pack_snapshot_ints(typed_columns[field]))
+    sizes = [8 + 8 * len(parts)] + [len(part) for part in parts]
+    directory = pack_snapshot_ints(array("Q", itertools.accumulate(sizes))[1:])
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        SNAPSHOT_SCHEMA,
+        len(data),
+        sum(sizes),
+        zlib.crc32(directory),
+    )
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(directory)
+        f.writelines(parts)
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path):
+    with open(path, "rb") as f:
+        if os.name == "nt":
+            buffer = f.read()
+        else:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < SNAPSHOT_HEADER.size:
+        return None
+    (magic, version, schema, count, size, crc) = SNAPSHOT_HEADER.unpack_from(buffer, 0)
+    if (
+        magic != SNAPSHOT_MAGIC
+        or version != SNAPSHOT_VERSION
+        or schema != SNAPSHOT_SCHEMA
+        or size != len(buffer) - SNAPSHOT_HEADER.size
+    ):
+        return None
+    reader = SnapshotReader(memoryview(buffer)[SNAPSHOT_HEADER.size :])
+    sections = reader.ints("Q")
+    if zlib.crc32(reader.buffer[: reader.pos]) != crc or not sections:
+        return None
+    if sections[-1] != size:
+        return None
+    reader.sections = iter(sections)
+    return parse_snapshot_payload(reader, count)
+
+
+def parse_snapshot_payload(reader, count):
+    stored = {field: reader.string_table() for field in STORED_FIELDS}
+    description_ends = array("B", reader.ints())
+    description_overrides = dict(zip(reader.ints(), reader.strings()))
+    hashes = reader.ints("Q")
+    texts = {field: reader.string_table() for field in INDEX_FIELDS}
+    packed = {}
+    for field in INDEX_FIELDS:
+        grams = reader.string_table()
+        offsets = reader.view()
+        flat = reader.view()
+        if len(offsets) != grams[1] + 1:
+            return None
+        packed[field] = functools.partial(
+            PackedPostings.from_snapshot, grams, offsets, flat
+        )
+    typed_columns = {field: reader.ints() for field in TYPED_FIELDS}
+    tables = list(stored.values()) + list(texts.values())
+    if (
+        any(table_count != count for (_, table_count) in tables)
+        or len(description_ends) != count
+        or len(hashes) != count
+        or any(len(values) != count for values in typed_columns.values())
+    ):
+        return None
+    columns = snapshot_string_columns(stored, INTERNED_FIELDS)
+    data = RecordTable.from_columns(
+        columns, description_ends, description_overrides, hashes
+    )
+    index = snapshot_string_columns(texts, INTERNED_INDEX_FIELDS)
+    postings = SnapshotColumns(packed)
+    search_index = TrigramIndex.from_packed(columns["id"], index, postings)
+    return (data, index, search_index, typed_columns)
+
+
+def sniff_encoding(prefix):
+    try:
+        decoded = codecs.getincrementaldecoder("utf-8")().decode(prefix)
+    except UnicodeDecodeError:
+        pass
+    else:
+        if any(ord(c) > 127 for c in decoded):
+            return "utf-8"
+    best_encoding = None
+    best_score = -1
+    for encoding in ENCODINGS_TO_TRY:
+        try:
+            decoded = codecs.getincrementaldecoder(encoding)().decode(prefix)
+        except UnicodeDecodeError:
+            continue
+        if any(ord(c) > 127 for c in decoded) and "юст" in decoded.lower():
+            return encoding
+        score = len(re.findall("[А-яЁё]", decoded))
+        if score > best_score:
+            best_encoding, best_score = encoding, score
+    if best_encoding is None:
+        raise ValueError("Unable to detect the encoding of the content.")
+    return best_encoding
+
+
+def iter_decoded_lines(chunks, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+MATERIAL_CATEGORY_RULES = [
+    (
+        "Книги/Брошюры",
+        [
+            "книга",
+            "книги",
+            "брошюра",
+            "учебник",
+            "печатный материал",
+            "монография",
+            "альманах",
+            "печатный",
+            "e-book",
+            "книжка",
+            "том",
+        ],
+        [],
+    ),
+    (
+        "Журналы",
+        ["журнал", "периодическое издание", "дайджест", "сборник статей"],
+        [],
+    ),
+    (
+        "Газеты",
+        ["газета", "пресса", "еженедельник", "вестник", "статья из газеты"],
+        [],
+    ),
+    (
+        "Листовки/Буклеты/Памятки",
+        [
+            "листовка",
+            "буклет",
+            "памятка",
+            "открытка",
+            "флаер",
+            "плакат",
+            "стикер",
+            "наклейка",
+            "баннер",
+            "агитационный материал",
+        ],
+        [],
+    ),
+    (
+        "Аудиозаписи",
+        [
+            "аудиозапись",
+            "песня",
+            "фонограмма",
+            "аудио",
+            "трек",
+            "звуковой файл",
+            "подкаст",
+            "музыкальная композиция",
+            "музыка",
+        ],
+        ["mp3", "wav", "flac", "ogg", "aac", "m4a", "wma"],
+    ),
+    (
+        "Видеозаписи",
+        [
+            "видеозапись",
+            "фильм",
+            "ролик",
+            "видеоматериал",
+            "видео",
+            "видеоклип",
+            "кинофильм",
+            "видеоролик",
+            "мультфильм",
+            "сюжет",
+            "трансляция",
+        ],
+        ["avi", "mp4", "mov", "wmv", "mkv", "flv"],
+    ),
+    (
+        "Изображения/Фото",
+        [
+            "изображение",
+            "фотография",
+            "рисунок",
+            "картинка",
+            "фото",
+            "графический файл",
+            "демонстрационный материал",
+            "коллаж",
+            "мем",
+            "карикатура",
+        ],
+        ["jpg", "jpeg", "png", "gif", "bmp", "webp"],
+    ),
+    (
+        "Веб-материалы",
+        [
+            "сайт",
+            "веб-страница",
+            "интернет-ресурс",
+            "онлайн",
+            "социальная сеть",
+            "telegram",
+            "vkontakte",
+            "мессенджер",
+            "форум",
+            "блог",
+            "канал",
+            "сообщество",
+            "url",
+            "ссылка",
+            "веб-сайт",
+            "интернет-портал",
+            "youtube",
+            "vk",
+            "twitter",
+            "facebook",
+            "instagram",
+            "http://",
+            "https://",
+            "ftp://",
+        ],
+        [],
+    ),
+    (
+        "Программы/ПО",
+        [
+            "программа",
+            "приложение",
+            "по",
+            "софт",
+            "исполняемый файл",
+            "скрипт",
+            "код",
+            "программное обеспечение",
+            "вирус",
+        ],
+        [
+            "exe",
+            "apk",
+            "dmg",
+            "iso",
+            "zip",
+            "rar",
+            "7z",
+            "dll",
+            "bin",
+            "sh",
+            "bat",
+            "py",
+            "js",
+        ],
+    ),
+    (
+        "Статьи/Тексты",
+        ["статья", "публикация", "текст", "документ", "рукопись", "записка", "письмо"],
+        [],
+    ),
+]
+
+
+def keyword_trie_pattern(keywords):
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    patterns = {}
+    stack = [(trie, False)]
+    while stack:
+        (node, built) = stack.pop()
+        if not built:
+            stack.append((node, True))
+            stack.extend((child, False) for (char, child) in node.items() if char)
+            continue
+        branches = [
+            re.escape(char) + patterns.pop(id(child))
+            for (char, child) in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            patterns[id(node)] = ""
+            continue
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        patterns[id(node)] = "(?:" + body + ")?" if "" in node else body
+    return patterns[id(trie)]
+
+
+def compile_keyword_pattern(keywords):
+    try:
+        return re.compile(keyword_trie_pattern(keywords))
+    except RecursionError:
+        keywords = sorted(keywords, key=len, reverse=True)
+        return re.compile("|".join(map(re.escape, keywords)))
+
+
+def compile_category_matcher(rules):
+    ranks = {}
+    for (rank, (_, keywords, extensions)) in enumerate(rules):
+        for keyword in keywords + ["." + extension for extension in extensions]:
+            ranks.setdefault(keyword, rank)
+    keyword_ranks = {
+        keyword: min(
+            rank for (prefix, rank) in ranks.items() if keyword.startswith(prefix)
+        )
+        for keyword in ranks
+    }
+    patterns = [None]
+    for limit in range(1, len(rules) + 1):
+        keywords = [
+            keyword for (keyword, rank) in keyword_ranks.items() if rank < limit
+        ]
+        patterns.append(re.compile(keyword_trie_pattern(keywords)))
+    return (patterns, keyword_ranks)
+
+
+MATERIAL_CATEGORY_PATTERNS, MATERIAL_KEYWORD_RANKS = compile_category_matcher(
+    MATERIAL_CATEGORY_RULES
+)
+
+
+def extract_material_category(description):
+    desc_lower = description.lower()
+    best = len(MATERIAL_CATEGORY_RULES)
+    position = 0
+    while best:
+        match = MATERIAL_CATEGORY_PATTERNS[best].search(desc_lower, position)
+        if match is None:
+            break
+        best = MATERIAL_KEYWORD_RANKS[match.group()]
+        position = match.start() + 1
+    if best == len(MATERIAL_CATEGORY_RULES):
+        return "Прочее"
+    return MATERIAL_CATEGORY_RULES[best][0]
+
+
+def csv_row_id(row):
+    if not row or not row[0].strip().isdigit():
+        return None
+    return row[0].strip()
+
+
+def rss_item_id(fields):
+    (guid, title_text) = fields[:2]
+    item_id_from_title = re.match("^\\s*(\\d+)", title_text)
+    return item_id_from_title.group(1) if item_id_from_title else guid
+
+
+def iter_unique_items(items, get_id, min_id=None):
+    seen_ids = set()
+    for item in items:
+        item_id = get_id(item)
+        if not item_id or item_id in seen_ids:
+            continue
+        if min_id is not None and (not item_id.isdigit() or int(item_id) <= min_id):
+            continue
+        seen_ids.add(item_id)
+        yield item
+
+
+def normalize_text(text):
+    text = unicodedata.normalize("NFKC", text).lower().translate(NORMALIZE_TABLE)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def fold_latin(text):
+    for (spelling, folded) in LATIN_FOLDS:
+        text = text.replace(spelling, folded)
+    return text
+
+
+def transliterate(text):
+    return fold_latin(text.translate(TRANSLIT_TABLE))
+
+
+def is_latin_query(query):
+    return bool(LATIN_QUERY_PATTERN.search(query)) and not CYRILLIC_PATTERN.search(
+        query
+    )
+
+
+def search_targets(query, fields):
+    targets = [(field, query) for field in fields]
+    if is_latin_query(query):
+        folded = fold_latin(query)
+        targets.extend(
+            (TRANSLIT_FIELDS[field], folded)
+            for field in fields
+            if field in TRANSLIT_FIELDS
+        )
+    return targets
+
+
+def narrows_targets(cached_targets, targets):
+    return all(
+        any(
+            cached_field == field and cached_text in text
+            for (cached_field, cached_text) in cached_targets
+        )
+        for (field, text) in targets
+    )
+
+
+def index_texts(title, author, description, date, court, category, file_info):
+    texts = [
+        normalize_text(text)
+        for text in (title, author, description, date, court, category, file_info)
+    ]
+    return tuple(texts) + (transliterate(texts[0]), transliterate(texts[1]))
+
+
+def record_index_texts(record, description):
+    return index_texts(
+        record.get("material_title", ""),
+        record.get("author_or_publisher", ""),
+        description,
+        record.get("entry_date", ""),
+        record.get("court_decision", ""),
+        record.get("category", ""),
+        record.get("file_info", ""),
+    )
+
+
+def parse_csv_row(row):
+    item_id = csv_row_id(row)
+    try:
+        original_full_description = row[1].strip() if len(row) > 1 else ""
+        work_description = original_full_description
+        date_inclusion = (
+            row[2].strip()
+            if len(row) > 2 and re.match("\\d{2}\\.\\d{2}\\.\\d{4}", row[2].strip())
+            else "Неизвестна"
+        )
+        court_decision = "Неизвестен"
+        decision_date = "Неизвестна"
+        court_name = "Неизвестен"
+        court_match = re.search("\\((решени[ея].*?)\\);?$", work_description)
+        if court_match:
+            court_decision = court_match.group(1).strip()
+            work_description = work_description[: court_match.start()].strip()
+            date_match = re.search("от\\s+(\\d{2}\\.\\d{2}\\.\\d{4})", court_decision)
+            if date_match:
+                decision_date = date_match.group(1)
+                court_name_full = re.search(
+                    "^(.*?)\\sот\\s+\\d{2}\\.\\d{2}\\.\\d{4}", court_decision
+                )
+                if court_name_full:
+                    court_name = (
+                        court_name_full.group(1)
+                        .replace("решение", "")
+                        .replace("решением", "")
+                        .strip()
+                    )
+            else:
+                court_name = court_decision
+        author = "Неизвестен"
+        material_title = "Без названия"
+        quoted_text_match = re.search("«([^»]+)»", work_description)
+        if quoted_text_match:
+            full_quoted_text = quoted_text_match.group(1).strip()
+            publisher_match = re.search(
+                "^(.*?)(?:\\s*[–-]\\s*(?:Издательство|Verlag|Publishing).*)",
+                full_quoted_text,
+            )
+            if publisher_match:
+                clean_title = publisher_match.group(1).strip().rstrip(",.")
+            else:
+                clean_title = full_quoted_text
+            material_title = clean_title
+            author_keyword_match = re.search(
+                '(?:автора|исполнителя)\\s+([^«"]+)',
+                work_description,
+                re.IGNORECASE,
+            )
+            if author_keyword_match:
+                author = author_keyword_match.group(1).strip().rstrip("«").strip()
+            elif "имя автора" in work_description.lower():
+                author_in_title_match = re.match(
+                    "^([\\w\\s-]+?\\.)\\s+([\\w\\s\\W]+)", clean_title
+                )
+                if author_in_title_match:
+                    author = author_in_title_match.group(1).strip().rstrip(".")
+                    material_title = author_in_title_match.group(2).strip()
+        category = extract_material_category(original_full_description)
+        display_description = preview_description(work_description)
+        record = {
+            "id": item_id,
+            "material_title": material_title,
+            "author_or_publisher": author,
+            "description": display_description,
+            "original_description": original_full_description,
+            "entry_date": date_inclusion,
+            "links": [],
+            "court_decision": court_decision,
+            "decision_date": decision_date,
+            "court_name": court_name,
+            "category": category,
+            "file_info": "Не указано",
+        }
+        texts = record_index_texts(record, work_description)
+    except Exception:
+        return None
+    return (record, texts)
+
+
+def parse_rss_item(fields):
+    (_, title_text, pub_date_text, description_html, link) = fields
+    item_id = rss_item_id(fields)
+    try:
+        date_inclusion = "Неизвестна"
+        if pub_date_text:
+            try:
+                pub_date = datetime.datetime.strptime(
+                    pub_date_text, "%a, %d %b %Y %H:%M:%S %z"
+                )
+                date_inclusion = pub_date.strftime("%d.%m.%Y")
+            except ValueError:
+                pass
+        original_full_description = strip_html(description_html)
+        work_description = original_full_description
+        court_decision = "Неизвестен"
+        decision_date = "Неизвестна"
+        court_name = "Неизвестен"
+        court_match = re.search("\\((решени[ея].*?)\\)$", work_description)
+        if court_match:
+            court_decision = court_match.group(1).strip()
+            work_description = work_description[: court_match.start()].strip()
+            date_match = re.search("от\\s+(\\d{2}\\.\\d{2}\\.\\d{4})", court_decision)
+            if date_match:
+                decision_date = date_match.group(1)
+                court_name_full = re.search(
+                    "^(.*?)\\sот\\s+\\d{2}\\.\\d{2}\\.\\d{4}", court_decision
+                )
+                if court_name_full:
+                    court_name = (
+                        court_name_full.group(1)
+                        .replace("решение", "")
+                        .replace("решением", "")
+                        .strip()
+                    )
+            else:
+                court_name = court_decision
+        material_title = re.sub("^\\d+:\\s*", "", title_text)
+        author = "Неизвестен"
+        author_keyword_match = re.search(
+            '(?:автора|исполнителя)\\s+([^«"]+)',
+            work_description,
+            re.IGNORECASE,
+        )
+        if author_keyword_match:
+            author = author_keyword_match.group(1).strip().rstrip("«").strip()
+        category = extract_material_category(original_full_description)
+        display_description = preview_description(work_description)
+        record = {
+            "id": item_id,
+            "material_title": material_title,
+            "author_or_publisher": author,
+            "description": display_description,
+            "original_description": original_full_description,
+            "entry_date": date_inclusion,
+            "links": [link] if link else [],
+            "court_decision": court_decision,
+            "decision_date": decision_date,
+            "court_name": court_name,
+            "category": category,
+            "file_info": "Не указано",
+        }
+        texts = record_index_texts(record, work_description)
+    except Exception:
+        return None
+    return (record, texts)
+
+
+HTML_TAG_PATTERN = re.compile("</?[A-Za-z][^>]*>")
+HTML_SLOW_PATH_PATTERN = re.compile(
+    "<[!?]|<(?:script|style)\\b|<[A-Za-z][^>]*=\\s*(?:\"[^\">]*>|'[^'>]*>)",
+    re.IGNORECASE,
+)
+HTML_REFERENCE_PATTERN = re.compile(
+    "&(?:#[0-9]+;|#[xX][0-9A-Fa-f]+;|([A-Za-z][A-Za-z0-9]*;))?"
+)
+
+
+def plain_html_references(text):
+    for match in HTML_REFERENCE_PATTERN.finditer(text):
+        name = match.group(1)
+        if match.group(0) == "&" or (name and name not in html.entities.html5):
+            return False
+    return True
+
+
+def strip_html(text):
+    if "<" not in text and "&" not in text:
+        return text.strip()
+    if HTML_SLOW_PATH_PATTERN.search(text) or not plain_html_references(text):
+        return BeautifulSoup(text, "html.parser").get_text(separator=" ", strip=True)
+    parts = (html.unescape(part).strip() for part in HTML_TAG_PATTERN.split(text))
+    return " ".join(part for part in parts if part)
+
+
+def element_text(element):
+    return "".join(element.itertext()) if element is not None else None
+
+
+def iter_rss_item_fields_lxml(content_bytes):
+    for (_, item) in etree.iterparse(
+        BytesIO(content_bytes),
+        events=("end",),
+        tag="item",
+        recover=True,
+        huge_tree=True,
+    ):
+        guid = element_text(item.find("guid"))
+        title = element_text(item.find("title"))
+        pub_date = element_text(item.find("pubDate"))
+        description = element_text(item.find("description"))
+        link = element_text(item.find("link"))
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+        yield (
+            guid.strip() if guid is not None else None,
+            title.strip() if title is not None else "",
+            pub_date or None,
+            description or "",
+            link or "",
+        )
+
+
+def iter_rss_item_fields(soup):
+    for item in soup.find_all("item"):
+        try:
+            yield (
+                item.guid.text.strip() if item.guid else None,
+                item.title.text.strip() if item.title else "",
+                item.pubDate.text if item.pubDate and item.pubDate.text else None,
+                item.description.text if item.description else "",
+                item.link.text if item.link else "",
+            )
+        except Exception:
+            continue
+
+
+def parse_csv_chunk(rows):
+    return [parse_csv_row(row) for row in rows]
+
+
+def parse_rss_chunk(items):
+    return [parse_rss_item(fields) for fields in items]
+
+
+def iter_chunks(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_in_chunks(function, items, workers=None):
+    workers = PARSE_WORKERS if workers is None else workers
+    items = iter(items)
+    head = list(itertools.islice(items, PARALLEL_MIN_ITEMS))
+    if workers <= 1 or len(head) < PARALLEL_MIN_ITEMS:
+        for chunk in iter_chunks(itertools.chain(head, items), PARSE_CHUNK_SIZE):
+            yield from function(chunk)
+        return
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        pending = deque()
+        for chunk in iter_chunks(itertools.chain(head, items), PARSE_CHUNK_SIZE):
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def build_parsed_dataset(results, progress_callback=None):
+    parsed_data = []
+    new_index = {field: [] for field in INDEX_FIELDS}
+    found_categories = set()
+    reported = 0
+    for result in results:
+        if result is None:
+            continue
+        (record, texts) = result
+        parsed_data.append(record)
+        for (field, text) in zip(INDEX_FIELDS, texts):
+            new_index[field].append(text)
+        found_categories.add(record["category"])
+        if progress_callback is not None and len(parsed_data) - reported >= 500:
+            reported = len(parsed_data)
+            progress_callback(reported)
+    sorted_categories = sorted(list(found_categories))
+    sorted_categories.insert(0, "Все категории")
+    return parsed_data, new_index, sorted_categories
+
+
+def load_http_cache(path=HTTP_CACHE_FILE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_http_cache(cache, path=HTTP_CACHE_FILE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=4)
+
+
+def parse_cli_headers(text):
+    status = None
+    headers = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("HTTP/"):
+            parts = line.split()
+            status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+            headers = {}
+        elif ":" in line:
+            (name, value) = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return (status, headers)
+
+
+class LoadInterrupted(Exception):
+    pass
+
+
+class LoadCancelled(LoadInterrupted):
+    pass
+
+
+class SourceNotModified(LoadInterrupted):
+    pass
+
+
+def decode_content_robust(content_bytes):
+    for encoding in ENCODINGS_TO_TRY:
+        try:
+            decoded = content_bytes.decode(encoding)
+            if any(ord(c) > 127 for c in decoded) and "юст" in decoded.lower():
+                return decoded
+        except UnicodeDecodeError:
+            continue
+    raise UnicodeDecodeError(
+        "Unable to decode content with any of the tried encodings."
+    )
+
+
+def parse_csv_content(content, progress_callback=None):
+    return parse_csv_lines(StringIO(content), progress_callback)
+
+
+def parse_csv_stream(chunks, progress_callback=None):
+    chunks = iter(chunks)
+    head = []
+    size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= ENCODING_SNIFF_SIZE:
+            break
+    encoding = sniff_encoding(b"".join(head)[:ENCODING_SNIFF_SIZE])
+    lines = iter_decoded_lines(itertools.chain(head, chunks), encoding)
+    return parse_csv_lines(lines, progress_callback)
+
+
+def parse_csv_lines(lines, progress_callback=None):
+    reader = csv.reader(lines, delimiter=";", quotechar='"')
+    rows = iter_unique_items(reader, csv_row_id)
+    return build_parsed_dataset(
+        parse_in_chunks(parse_csv_chunk, rows), progress_callback
+    )
+
+
+def parse_rss_bytes(content_bytes, progress_callback=None, min_id=None):
+    try:
+        items = iter_unique_items(
+            iter_rss_item_fields_lxml(content_bytes), rss_item_id, min_id
+        )
+        return build_parsed_dataset(
+            parse_in_chunks(parse_rss_chunk, items), progress_callback
+        )
+    except etree.LxmlError:
+        return parse_rss_content(
+            decode_content_robust(content_bytes), progress_callback, min_id
+        )
+
+
+def parse_rss_content(content, progress_callback=None, min_id=None):
+    soup = BeautifulSoup(content, "xml")
+    items = iter_unique_items(iter_rss_item_fields(soup), rss_item_id, min_id)
+    return build_parsed_dataset(
+        parse_in_chunks(parse_rss_chunk, items), progress_callback
+    )
+
+
+def parse_file(file_path, progress_callback=None):
+    with open(file_path, "rb") as f:
+        if file_path.lower().endswith((".csv", ".txt")):
+            return parse_csv_stream(
+                iter(lambda: f.read(STREAM_CHUNK_SIZE), b""), progress_callback
+            )
+        return parse_rss_bytes(f.read(), progress_callback)
+
+
+class RecordStore:
+    def __init__(self, directory=""):
+        self.data_path = os.path.join(directory, DATA_FILE_PATH)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE_PATH)
+        self.previous_path = os.path.join(directory, PREVIOUS_SNAPSHOT_FILE_PATH)
+        self.previous_rows_path = os.path.join(directory, PREVIOUS_ROWS_FILE_PATH)
+        self.delta_path = os.path.join(directory, DELTA_FILE_PATH)
+        self.http_cache_path = os.path.join(directory, HTTP_CACHE_FILE_PATH)
+        self.watchlist_path = os.path.join(directory, WATCHLIST_FILE_PATH)
+        self.data = RecordTable()
+        self.index = {}
+        self.search_index = TrigramIndex()
+        self.typed_columns = {field: array("I") for field in TYPED_FIELDS}
+        self.sort_orders = {}
+        self.search_cache = OrderedDict()
+        self.fuzzy_index = None
+        self.ranked_index = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def record(self, row):
+        return dict(self.data[row])
+
+    def replace(self, data, index, search_index=None, typed_columns=None):
+        if not isinstance(data, RecordTable):
+            data = RecordTable(data)
+        if search_index is None:
+            search_index = TrigramIndex(data, index)
+        if typed_columns is None:
+            typed_columns = {
+                field: typed_column(data.columns[field], field)
+                for field in TYPED_FIELDS
+            }
+        if not isinstance(index, SnapshotColumns):
+            for field in INTERNED_INDEX_FIELDS:
+                index[field][:] = map(sys.intern, index[field])
+        self.data, self.index, self.search_index = data, index, search_index
+        self.typed_columns = typed_columns
+        self.sort_orders = {}
+        self.search_cache.clear()
+        self.fuzzy_index = None
+        self.ranked_index = None
+
+    def categories(self):
+        sorted_categories = sorted(set(self.data.columns["category"]))
+        sorted_categories.insert(0, "Все категории")
+        return sorted_categories
+
+    def newest_first(self):
+        return self.sorted_rows(range(len(self.data)), "id", descending=True)
+
+    def max_id(self):
+        ids = [int(item_id) for item_id in self.search_index.ids if item_id.isdigit()]
+        return max(ids) if ids else None
+
+    def search(self, query, criteria="Все поля", category="Все категории"):
+        if criteria in SCORED_CRITERIA:
+            matches = self.scored_matches(query, criteria, category)
+            return [row for (row, _) in matches]
+        query = normalize_text(query)
+        plan = compile_query(query, criteria)
+        if plan is not None:
+            rows = plan.execute(self)
+        elif query:
+            rows = self.matching_rows(query, criteria)
+        else:
+            rows = range(len(self.data))
+        accept = self.category_filter(category)
+        if accept is not None:
+            rows = [i for i in rows if accept(i)]
+        return list(rows)
+
+    def sort_order(self, field):
+        cached = self.sort_orders.get(field)
+        if cached is None:
+            if field in self.typed_columns:
+                key = self.typed_columns[field].__getitem__
+            else:
+                values = [str(value).lower() for value in self.data.columns[field]]
+                key = values.__getitem__
+            order = array("I", sorted(range(len(self.data)), key=key))
+            ranks = array("I", bytes(4 * len(order)))
+            for (position, row) in enumerate(order):
+                ranks[row] = position
+            cached = self.sort_orders[field] = (order, ranks)
+        return cached
+
+    def sorted_rows(self, rows, field, descending=False):
+        (order, ranks) = self.sort_order(field)
+        if len(rows) == len(order):
+            rows = list(order)
+        else:
+            rows = sorted(rows, key=ranks.__getitem__)
+        if descending:
+            rows.reverse()
+        return rows
+
+    def category_filter(self, category):
+        if category == "Все категории":
+            return None
+        category = category.lower()
+        categories = self.data.columns["category"]
+        return lambda row: categories[row].lower() == category
+
+    def scored_matches(self, query, criteria, category="Все категории"):
+        if criteria == FUZZY_CRITERIA:
+            return self.fuzzy_matches(query, category)
+        return self.ranked_matches(query, category)
+
+    def build_scored_indexes(self):
+        if self.fuzzy_index is None:
+            self.fuzzy_index = FuzzyIndex(self.index)
+        if self.ranked_index is None:
+            self.ranked_index = RankedIndex(self.index)
+
+    def fuzzy_matches(self, query, category="Все категории"):
+        if self.fuzzy_index is None:
+            self.fuzzy_index = FuzzyIndex(self.index)
+        query = normalize_text(query)
+        if is_latin_query(query):
+            query = fold_latin(query)
+        matches = self.fuzzy_index.search(query)
+        accept = self.category_filter(category)
+        if accept is not None:
+            matches = [(row, score) for (row, score) in matches if accept(row)]
+        return matches[:FUZZY_MAX_RESULTS]
+
+    def ranked_matches(self, query, category="Все категории", limit=RANKED_MAX_RESULTS):
+        if self.ranked_index is None:
+            self.ranked_index = RankedIndex(self.index)
+        query = normalize_text(query)
+        terms = set(RANK_TOKEN_PATTERN.findall(query))
+        if is_latin_query(query):
+            terms.update(RANK_TOKEN_PATTERN.findall(fold_latin(query)))
+        return self.ranked_index.search(terms, limit, self.category_filter(category))
+
+    def matching_rows(self, query, criteria):
+        key = (query, criteria)
+        rows = self.search_cache.get(key)
+        if rows is not None:
+            self.search_cache.move_to_end(key)
+            return rows
+        fields = SEARCH_CRITERIA_FIELDS.get(criteria, [])
+        targets = search_targets(query, fields)
+        narrowed = self.cached_superset(query, criteria, targets)
+        if criteria == "Номер":
+            rows = self.search_index.lookup_id(query)
+        elif narrowed is not None and (
+            len(query) < 3 or len(narrowed) <= SEARCH_NARROW_MAX_ROWS
+        ):
+            columns = [
+                (self.search_index.columns[field], text) for (field, text) in targets
+            ]
+            rows = [
+                i
+                for i in narrowed
+                if any(text in column[i] for (column, text) in columns)
+            ]
+        else:
+            rows = self.search_index.search_targets(targets)
+        self.search_cache[key] = rows
+        if len(self.search_cache) > SEARCH_CACHE_SIZE:
+            self.search_cache.popitem(last=False)
+        return rows
+
+    def cached_superset(self, query, criteria, targets):
+        best = None
+        fields = SEARCH_CRITERIA_FIELDS.get(criteria, [])
+        for ((cached_query, cached_criteria), rows) in self.search_cache.items():
+            if (
+                cached_criteria == criteria
+                and cached_query in query
+                and (best is None or len(rows) < len(best))
+                and narrows_targets(search_targets(cached_query, fields), targets)
+            ):
+                best = rows
+        return best
+
+    def merge(self, data, index):
+        self.search_cache.clear()
+        start = len(self.data)
+        for (i, item) in enumerate(data):
+            if item.get("id") in self.search_index.ids:
+                continue
+            self.data.append(item)
+            for field in INDEX_FIELDS:
+                value = index[field][i]
+                if field in INTERNED_INDEX_FIELDS:
+                    value = sys.intern(value)
+                self.index[field].append(value)
+        self.search_index.extend(self.data, start)
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.extend(self.index, start)
+        if len(self.data) > start:
+            self.ranked_index = None
+        for field in TYPED_FIELDS:
+            values = self.data.columns[field][start:]
+            self.typed_columns[field].extend(typed_column(values, field))
+        self.sort_orders.clear()
+        return start
+
+    def load(self):
+        if os.path.exists(self.snapshot_path) and self.load_snapshot():
+            self.replay_journal()
+            return True
+        if not os.path.exists(self.data_path):
+            return False
+        self.load_json()
+        try:
+            write_snapshot(
+                self.snapshot_path,
+                self.data,
+                self.index,
+                self.search_index,
+                self.typed_columns,
+            )
+        except OSError:
+            pass
+        self.replay_journal()
+        return True
+
+    def load_snapshot(self):
+        try:
+            snapshot = read_snapshot(self.snapshot_path)
+        except Exception:
+            snapshot = None
+        if snapshot is None:
+            return False
+        self.replace(*snapshot)
+        return True
+
+    def load_json(self):
+        with open(self.data_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = {field: [] for field in INDEX_FIELDS}
+        for (i, item) in enumerate(data):
+            item.setdefault("id", str(i + 1))
+            item.setdefault("material_title", "Без названия")
+            item.setdefault("author_or_publisher", "Неизвестен")
+            item.setdefault("description", "")
+            item.setdefault("original_description", item.get("description", ""))
+            item.setdefault("entry_date", "Неизвестна")
+            item.setdefault("links", [])
+            item.setdefault("court_decision", "Неизвестен")
+            item.setdefault("decision_date", "Неизвестна")
+            item.setdefault("court_name", "Неизвестен")
+            item.setdefault(
+                "category",
+                extract_material_category(
+                    item.get("original_description", "")
+                    + " "
+                    + item.get("material_title", "")
+                ),
+            )
+            item.setdefault("file_info", "Не указано")
+            texts = record_index_texts(item, item.get("original_description", ""))
+            for (field, text) in zip(INDEX_FIELDS, texts):
+                index[field].append(text)
+        self.replace(data, index)
+
+    def save(self):
+        write_snapshot(
+            self.snapshot_path,
+            self.data,
+            self.index,
+            self.search_index,
+            self.typed_columns,
+        )
+        with open(self.data_path, "w", encoding="utf-8") as f:
+            json.dump([dict(item) for item in self.data], f, ensure_ascii=False)
+        if os.path.exists(self.delta_path):
+            os.remove(self.delta_path)
+
+    def keep_previous(self, merge=False):
+        if not len(self.data):
+            return
+        if merge:
+            temp_path = self.previous_rows_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"rows": len(self.data)}, f)
+            os.replace(temp_path, self.previous_rows_path)
+            stale_path = self.previous_path
+        else:
+            write_snapshot(
+                self.previous_path,
+                self.data,
+                self.index,
+                self.search_index,
+                self.typed_columns,
+            )
+            stale_path = self.previous_rows_path
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    def previous_rows(self):
+        try:
+            with open(self.previous_rows_path, "r", encoding="utf-8") as f:
+                return int(json.load(f)["rows"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def changes(self):
+        rows = self.previous_rows()
+        if rows is not None:
+            return RecordDiff(list(range(rows, len(self.data))), [], [])
+        try:
+            previous = read_snapshot(self.previous_path)
+        except Exception:
+            previous = None
+        if previous is None:
+            return None
+        return diff_tables(previous[0], self.data)
+
+    def append_journal(self, start):
+        with open(self.delta_path, "a", encoding="utf-8") as f:
+            for row in range(start, len(self.data)):
+                entry = {
+                    "record": self.record(row),
+                    "index": {field: self.index[field][row] for field in INDEX_FIELDS},
+                }
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        if os.path.getsize(self.delta_path) > DELTA_COMPACT_SIZE:
+            self.save()
+
+    def replay_journal(self):
+        if not os.path.exists(self.delta_path):
+            return
+        data = []
+        index = {field: [] for field in INDEX_FIELDS}
+        try:
+            with open(self.delta_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    data.append(entry["record"])
+                    texts = record_index_texts(
+                        entry["record"], entry["index"]["description"]
+                    )
+                    for (field, text) in zip(INDEX_FIELDS, texts):
+                        index[field].append(text)
+        except (OSError, ValueError, KeyError):
+            os.remove(self.delta_path)
+            return
+        self.merge(data, index)
+
+
+BATCH_REPORT_HEADER = ["Запрос", "№", "Совпавшие поля", "Название материала"]
+DIFF_REPORT_HEADER = ["Изменение", "№", "Измененные поля", "Название материала"]
+DIFF_CHANGE_LABELS = {
+    "added": "добавлена",
+    "modified": "изменена",
+    "removed": "удалена",
+}
+EXPORT_FORMATS = ["txt", "csv", "html", "jsonl"]
+EXPORT_CHUNK_SIZE = 500
+EXPORT_BUFFER_SIZE = 1024 * 1024
+EXPORT_GZIP_LEVEL = 6
+EXPORT_CSV_HEADER = [
+    "№",
+    "Название материала",
+    "Автор/Издатель",
+    "Полное описание",
+    "Дата включения",
+    "Суд",
+    "Категория",
+    "Ссылки",
+]
+EXPORT_HTML_HEAD = "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>Экстремистские материалы</title>\n<style>\nbody { font-family: 'Ubuntu', sans-serif; background-color: #2b2b2b; color: #e0e0e0; }\ntable { width: 100%; border-collapse: collapse; margin-top: 20px; }\nth, td { border: 1px solid #505050; padding: 8px; text-align: left; }\nth { background-color: #3c3c3c; color: #d17a3a; }\ntr:nth-child(even) { background-color: #353535; }\na { color: #e08b47; text-decoration: none; }\na:hover { text-decoration: underline; }\n</style>\n</head>\n<body>\n<h1>Список экстремистских материалов</h1>\n<table>\n<thead>\n<tr><th>№</th><th>Название материала</th><th>Автор/Издатель</th><th>Описание</th><th>Дата включения</th><th>Суд</th><th>Категория</th><th>Ссылки</th></tr>\n</thead>\n<tbody>\n"
+EXPORT_HTML_TAIL = "</tbody>\n</table>\n</body>\n</html>"
+
+
+def iter_batch_queries(lines, column=None, delimiter=";"):
+    if column is None:
+        yield from lines
+        return
+    for row in csv.reader(lines, delimiter=delimiter):
+        if len(row) > column:
+            yield row[column]
+
+
+class BatchMatcher:
+    def __init__(self, queries, translit=True):
+        self.queries = []
+        self.keys = {}
+        for query in queries:
+            key = normalize_text(query)
+            if key and key not in self.keys:
+                self.keys[key] = len(self.queries)
+                self.queries.append(query.strip())
+        self.pattern = compile_keyword_pattern(self.keys) if self.keys else None
+        self.prefixes = {
+            key: [key[:i] for i in range(1, len(key) + 1) if key[:i] in self.keys]
+            for key in self.keys
+        }
+        self.translit_keys = {}
+        if translit:
+            for key in self.keys:
+                if is_latin_query(key):
+                    self.translit_keys.setdefault(fold_latin(key), []).append(key)
+        self.translit = (
+            BatchMatcher(self.translit_keys, False) if self.translit_keys else None
+        )
+
+    def __len__(self):
+        return len(self.queries)
+
+    def match(self, text):
+        found = set()
+        if self.pattern is None:
+            return found
+        position = 0
+        while True:
+            match = self.pattern.search(text, position)
+            if match is None:
+                return found
+            found.update(self.prefixes[match.group()])
+            position = match.start() + 1
+
+    @staticmethod
+    def texts(store, field, rows):
+        column = store.index.get(field, [])
+        if rows is None:
+            return enumerate(column)
+        return ((row, column[row]) for row in rows)
+
+    def run(self, store, fields=TEXT_FIELDS, rows=None):
+        hits = [{} for _ in self.queries]
+        for field in fields:
+            for (row, text) in self.texts(store, field, rows):
+                for key in self.match(text):
+                    hits[self.keys[key]].setdefault(row, []).append(field)
+            shadow = TRANSLIT_FIELDS.get(field)
+            if self.translit is None or shadow is None:
+                continue
+            for (row, text) in self.texts(store, shadow, rows):
+                for folded in self.translit.match(text):
+                    for key in self.translit_keys[folded]:
+                        row_fields = hits[self.keys[key]].setdefault(row, [])
+                        if field not in row_fields:
+                            row_fields.append(field)
+        return hits
+
+
+def batch_report_entry(store, query, rows):
+    return {
+        "query": query,
+        "hits": [
+            {
+                "id": store.record(row).get("id"),
+                "material_title": store.record(row).get("material_title"),
+                "fields": fields,
+            }
+            for (row, fields) in sorted(rows.items())
+        ],
+    }
+
+
+def write_batch_report(f, matcher, hits, store, output_format="csv"):
+    writer = csv.writer(f, delimiter=";")
+    if output_format == "csv":
+        writer.writerow(BATCH_REPORT_HEADER)
+    matched = 0
+    for (query, rows) in zip(matcher.queries, hits):
+        matched += bool(rows)
+        if output_format == "json":
+            entry = batch_report_entry(store, query, rows)
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            continue
+        if not rows:
+            writer.writerow([query, "", "", ""])
+        for (row, fields) in sorted(rows.items()):
+            record = store.record(row)
+            writer.writerow(
+                [
+                    query,
+                    record.get("id", "N/A"),
+                    ", ".join(fields),
+                    record.get("material_title", "Без названия"),
+                ]
+            )
+    return matched
+
+
+class Watchlist:
+    def __init__(self, path=WATCHLIST_FILE_PATH):
+        self.path = path
+        self.queries = []
+        self.high_water = None
+        self.alerts = []
+        self.matcher = None
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return self
+        self.queries = [str(query) for query in state.get("queries", [])]
+        self.high_water = state.get("high_water")
+        self.alerts = state.get("alerts", [])
+        self.matcher = None
+        return self
+
+    def save(self):
+        state = {
+            "queries": self.queries,
+            "high_water": self.high_water,
+            "alerts": self.alerts,
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=4)
+        os.replace(temp_path, self.path)
+
+    def update(self, queries, store):
+        self.matcher = BatchMatcher(queries)
+        self.queries = self.matcher.queries
+        self.screen(store)
+        self.save()
+
+    def compiled(self):
+        if self.matcher is None:
+            self.matcher = BatchMatcher(self.queries)
+        return self.matcher
+
+    def new_rows(self, store):
+        ids = store.typed_columns["id"]
+        known = [key for key in ids if key != MISSING_ID]
+        top = max(known, default=self.high_water)
+        if self.high_water is None:
+            return ([], top)
+        rows = [
+            row for (row, key) in enumerate(ids) if self.high_water < key != MISSING_ID
+        ]
+        return (rows, max(top, self.high_water))
+
+    def screen(self, store, fields=TEXT_FIELDS):
+        (rows, high_water) = self.new_rows(store)
+        alerts = []
+        if rows and self.queries:
+            matcher = self.compiled()
+            hits = matcher.run(store, fields, rows)
+            for (query, matches) in zip(matcher.queries, hits):
+                for (row, row_fields) in sorted(matches.items()):
+                    alerts.append(
+                        {
+                            "query": query,
+                            "id": store.data.value(row, "id"),
+                            "material_title": store.data.value(row, "material_title"),
+                            "fields": row_fields,
+                        }
+                    )
+        if alerts or high_water != self.high_water:
+            self.high_water = high_water
+            self.alerts.extend(alerts)
+            self.save()
+        return alerts
+
+    def clear_alerts(self):
+        self.alerts = []
+        self.save()
+
+
+def diff_report_entries(diff, data):
+    for row in diff.added:
+        yield ("added", data[row], [], None)
+    for (row, before, fields) in diff.modified:
+        yield ("modified", data[row], fields, before)
+    for before in diff.removed:
+        yield ("removed", before, [], None)
+
+
+def write_diff_report(f, diff, data, output_format="csv"):
+    writer = csv.writer(f, delimiter=";")
+    if output_format == "csv":
+        writer.writerow(DIFF_REPORT_HEADER)
+    for (change, item, fields, before) in diff_report_entries(diff, data):
+        if output_format == "json":
+            entry = {"change": change, "record": dict(item), "fields": fields}
+            if before is not None:
+                entry["previous"] = {field: before[field] for field in fields}
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            continue
+        writer.writerow(
+            [
+                DIFF_CHANGE_LABELS[change],
+                item.get("id", "N/A"),
+                ", ".join(fields),
+                item.get("material_title", "Без названия"),
+            ]
+        )
+    return len(diff)
+
+
+def export_diff_to_path(path, diff, data):
+    output_format = "json" if export_format(path) == "jsonl" else "csv"
+    with open_export_file(path, output_format) as f:
+        return write_diff_report(f, diff, data, output_format)
+
+
+def export_text_entry(item):
+    return (
+        f"№: {item.get('id', 'N/A')}\n"
+        f"Название материала: {item.get('material_title', 'Без названия')}\n"
+        f"Автор/Издатель: {item.get('author_or_publisher', 'Неизвестен')}\n"
+        f"Описание: {item.get('original_description', '')}\n"
+        f"Включено: {item.get('entry_date', 'Неизвестна')}\n"
+        f"Решение: {item.get('court_name', 'Неизвестен')}\n"
+        f"Категория: {item.get('category', 'Прочее')}\n"
+        f"Ссылки: {', '.join(item.get('links', []))}\n" + "-" * 50 + "\n"
+    )
+
+
+def export_csv_row(item):
+    return [
+        item.get("id", "N/A"),
+        item.get("material_title", "Без названия"),
+        item.get("author_or_publisher", "Неизвестен"),
+        item.get("original_description", "")
+        .replace("\n", " ")
+        .replace("\r", " ")
+        .replace(";", ","),
+        item.get("entry_date", "Неизвестна"),
+        item.get("court_name", "Неизвестен"),
+        item.get("category", "Прочее"),
+        ", ".join(item.get("links", [])),
+    ]
+
+
+def export_html_row(item):
+    escape = html.escape
+    cells = "".join(
+        f"<td>{escape(str(value))}</td>"
+        for value in (
+            item.get("id", "N/A"),
+            item.get("material_title", "Без названия"),
+            item.get("author_or_publisher", "Неизвестен"),
+            item.get("original_description", ""),
+            item.get("entry_date", "Неизвестна"),
+            item.get("court_name", "Неизвестен"),
+            item.get("category", "Прочее"),
+        )
+    )
+    links = ", ".join(
+        f'<a href="{escape(link)}" target="_blank">{escape(link)}</a>'
+        for link in item.get("links", [])
+    )
+    return f"<tr>{cells}<td>{links}</td></tr>\n"
+
+
+def export_jsonl_entry(item):
+    return json.dumps(dict(item), ensure_ascii=False) + "\n"
+
+
+EXPORT_ENTRY_WRITERS = {
+    "txt": export_text_entry,
+    "html": export_html_row,
+    "jsonl": export_jsonl_entry,
+}
+
+
+def export_format(path):
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    for output_format in EXPORT_FORMATS:
+        if name.endswith("." + output_format):
+            return output_format
+    return "txt"
+
+
+def open_export_file(path, output_format):
+    newline = "" if output_format == "csv" else None
+    if path.lower().endswith(".gz"):
+        return gzip.open(
+            path,
+            "wt",
+            compresslevel=EXPORT_GZIP_LEVEL,
+            encoding="utf-8",
+            newline=newline,
+        )
+    return open(
+        path, "w", encoding="utf-8", newline=newline, buffering=EXPORT_BUFFER_SIZE
+    )
+
+
+def write_export(f, records, rows, output_format="txt", progress=None):
+    writer = None
+    if output_format == "csv":
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(EXPORT_CSV_HEADER)
+    elif output_format == "html":
+        f.write(EXPORT_HTML_HEAD)
+    entry = EXPORT_ENTRY_WRITERS.get(output_format)
+    for start in range(0, len(rows), EXPORT_CHUNK_SIZE):
+        chunk = [records[row] for row in rows[start : start + EXPORT_CHUNK_SIZE]]
+        if writer is not None:
+            writer.writerows(map(export_csv_row, chunk))
+        else:
+            f.write("".join(map(entry, chunk)))
+        if progress is not None:
+            progress(start + len(chunk), len(rows))
+    if output_format == "html":
+        f.write(EXPORT_HTML_TAIL)
+    return len(rows)
+
+
+def export_to_path(path, records, rows, progress=None):
+    output_format = export_format(path)
+    with open_export_file(path, output_format) as f:
+        return write_export(f, records, rows, output_format, progress)
+
+
+class LoadResult:
+    def __init__(
+        self, kind, data, index, search_index=None, categories=None, message=""
+    ):
+        self.kind = kind
+        self.data = data
+        self.index = index
+        self.search_index = search_index
+        self.categories = categories
+        self.message = message
+
+
+class DataLoader:
+    def __init__(
+        self, store, delta_from=None, progress=None, stage=None, records_parsed=None
+    ):
+        self.store = store
+        self.delta_from = delta_from
+        self.http_cache = load_http_cache(store.http_cache_path) if store.data else {}
+        self.pending_http_cache = {}
+        self.cancelled = False
+        self.process = None
+        self.current_stage = ""
+        self.progress = progress or (lambda message: None)
+        self.stage = stage or (lambda stage: None)
+        self.records_parsed = records_parsed or (lambda stage, count: None)
+
+    def cancel(self):
+        self.cancelled = True
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise LoadCancelled()
+
+    def report_parsed(self, count):
+        self.check_cancelled()
+        self.records_parsed(self.current_stage, count)
+
+    def load(self):
+        if self.delta_from is not None:
+            return self.load_rss_delta()
+        return self.load_rss()
+
+    def set_stage(self, stage, message):
+        self.check_cancelled()
+        self.current_stage = stage
+        self.stage(stage)
+        self.progress(message)
+
+    def conditional_headers(self, url, headers=None):
+        headers = dict(headers or {})
+        entry = self.http_cache.get(url, {})
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def remember_digest(self, url, digest, etag, last_modified):
+        self.pending_http_cache[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": digest,
+        }
+        if self.http_cache.get(url, {}).get("sha256") == digest:
+            raise SourceNotModified()
+
+    def commit_http_cache(self):
+        if not self.pending_http_cache:
+            return
+        cache = load_http_cache(self.store.http_cache_path)
+        cache.update(self.pending_http_cache)
+        save_http_cache(cache, self.store.http_cache_path)
+        self.pending_http_cache = {}
+
+    def hashing(self, url, chunks, etag, last_modified):
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            self.check_cancelled()
+            digest.update(chunk)
+            yield chunk
+        self.remember_digest(url, digest.hexdigest(), etag, last_modified)
+
+    def stream(self, url, headers=None):
+        with requests.get(
+            url,
+            headers=self.conditional_headers(url, headers),
+            verify=False,
+            timeout=30,
+            stream=True,
+        ) as response:
+            if response.status_code == 304:
+                raise SourceNotModified()
+            response.raise_for_status()
+            yield from self.hashing(
+                url,
+                response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+
+    def download(self, url, headers=None):
+        return b"".join(self.stream(url, headers))
+
+    def finish_rss(self, content_bytes, message):
+        data, index, categories = parse_rss_bytes(content_bytes, self.report_parsed)
+        return self.finish_parsed(data, index, categories, message)
+
+    def finish_stream(self, chunks, message):
+        data, index, categories = parse_csv_stream(chunks, self.report_parsed)
+        return self.finish_parsed(data, index, categories, message)
+
+    def finish_parsed(self, data, index, categories, message):
+        self.check_cancelled()
+        self.progress(f"{self.current_stage}: построение поискового индекса...")
+        search_index = TrigramIndex(data, index)
+        self.check_cancelled()
+        return LoadResult("loaded", data, index, search_index, categories, message)
+
+    def load_rss_delta(self):
+        self.set_stage("RSS", "Проверка новых записей в RSS-ленте...")
+        try:
+            content_bytes = self.download(RSS_URL)
+            self.check_cancelled()
+            data, index, _ = parse_rss_bytes(
+                content_bytes, self.report_parsed, min_id=self.delta_from
+            )
+            self.check_cancelled()
+            return LoadResult("merged", data, index)
+        except LoadInterrupted:
+            raise
+        except Exception as e:
+            self.progress(f"Ошибка загрузки RSS: {str(e)}. Попытка загрузки CSV...")
+            return self.load_csv_from_web_smart()
+
+    def load_rss(self):
+        self.set_stage("RSS", "Загрузка данных из интернета (RSS)...")
+        try:
+            content_bytes = self.download(RSS_URL)
+            return self.finish_rss(content_bytes, "Загружено {} записей из RSS-ленты.")
+        except LoadInterrupted:
+            raise
+        except Exception as e:
+            self.progress(f"Ошибка загрузки RSS: {str(e)}. Попытка загрузки CSV...")
+            return self.load_csv_from_web_smart()
+
+    def load_csv_from_web_smart(self):
+        self.set_stage("CSV", "Попытка загрузки CSV из интернета (requests)...")
+        try:
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+                "Accept-Language": "ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3",
+                "Referer": "https://minjust.gov.ru/ru/extremist-materials/",
+            }
+            return self.finish_stream(
+                self.stream(CSV_URL, headers=headers),
+                "Загружено {} записей из CSV-файла.",
+            )
+        except LoadInterrupted:
+            raise
+        except Exception as e:
+            self.progress(
+                f"Ошибка загрузки CSV (requests): {str(e)}. Попытка через wget/curl..."
+            )
+            return self.load_csv_from_web_cli()
+
+    def load_csv_from_web_cli(self):
+        self.set_stage(
+            "CLI", "Попытка загрузки CSV через командную строку (wget/curl)..."
+        )
+        temp_csv_file = "temp_minjust_export.csv"
+        temp_headers_file = "temp_minjust_export.headers"
+        command = []
+        conditional = self.conditional_headers(CSV_URL)
+        curl_command = [
+            "curl",
+            "-k",
+            "-o",
+            temp_csv_file,
+            CSV_URL,
+            "-H",
+            "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "-H",
+            "Referer: https://minjust.gov.ru/ru/extremist-materials/",
+            "-D",
+            temp_headers_file,
+        ]
+        for (name, value) in conditional.items():
+            curl_command += ["-H", f"{name}: {value}"]
+        wget_command = [
+            "wget",
+            "--no-check-certificate",
+            "-O",
+            temp_csv_file,
+            CSV_URL,
+            "--header=User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "--header=Referer: https://minjust.gov.ru/ru/extremist-materials/",
+            "--server-response",
+        ]
+        for (name, value) in conditional.items():
+            wget_command.append(f"--header={name}: {value}")
+        if platform.system() == "Windows":
+            candidates = [curl_command, wget_command]
+        else:
+            candidates = [wget_command, curl_command]
+        for candidate in candidates:
+            try:
+                subprocess.run(
+                    [candidate[0], "--version"], capture_output=True, check=True
+                )
+                command = candidate
+                break
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                continue
+        if not command:
+            raise Exception(
+                "Ошибка: wget или curl не найдены. Не удалось загрузить CSV через CLI."
+            )
+        try:
+            headers_output = (
+                open(temp_headers_file, "wb") if command[0] == "wget" else None
+            )
+            try:
+                self.process = subprocess.Popen(
+                    command,
+                    stdout=subprocess.DEVNULL,
+                    stderr=headers_output or subprocess.DEVNULL,
+                )
+                while True:
+                    try:
+                        returncode = self.process.wait(timeout=0.2)
+                        break
+                    except subprocess.TimeoutExpired:
+                        self.check_cancelled()
+            finally:
+                if headers_output is not None:
+                    headers_output.close()
+            self.check_cancelled()
+            (status, response_headers) = (None, {})
+            if os.path.exists(temp_headers_file):
+                with open(
+                    temp_headers_file, "r", encoding="utf-8", errors="replace"
+                ) as f:
+                    (status, response_headers) = parse_cli_headers(f.read())
+            if status == 304:
+                raise SourceNotModified()
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, command)
+            with open(temp_csv_file, "rb") as f:
+                return self.finish_stream(
+                    self.hashing(
+                        CSV_URL,
+                        iter(lambda: f.read(STREAM_CHUNK_SIZE), b""),
+                        response_headers.get("etag"),
+                        response_headers.get("last-modified"),
+                    ),
+                    "Загружено {} записей из CSV-файла (CLI).",
+                )
+        except LoadInterrupted:
+            raise
+        except Exception as e:
+            raise Exception(f"Ошибка загрузки CSV (CLI): {str(e)}")
+        finally:
+            if self.process is not None:
+                if self.process.poll() is None:
+                    self.process.kill()
+                self.process.wait()
+                self.process = None
+            for temp_file in (temp_csv_file, temp_headers_file):
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+
+
+def refresh_store(store, full=False, progress=None):
+    delta_from = None if full else store.max_id()
+    loader = DataLoader(store, delta_from=delta_from, progress=progress)
+    try:
+        result = loader.load()
+    except SourceNotModified:
+        loader.commit_http_cache()
+        return f"Данные на сайте не изменились ({loader.current_stage}), используется сохраненная копия."
+    if result.kind != "merged" or result.data:
+        store.keep_previous(result.kind == "merged")
+    if result.kind == "merged":
+        start = store.merge(result.data, result.index)
+        added = len(store) - start
+        if added:
+            store.append_journal(start)
+        message = f"Добавлено {added} новых записей из RSS-ленты."
+    else:
+        store.replace(result.data, result.index, result.search_index)
+        store.save()
+        message = result.message.format(len(store))
+    loader.commit_http_cache()
+    return message
@@ -0,0 +1,301 @@
+import asyncio, json, os, time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs, unquote
+from justice4all_core import (
+    RecordStore,
+    BatchMatcher,
+    SEARCH_CRITERIA_FIELDS,
+    SCORED_CRITERIA,
+    QuerySyntaxError,
+    batch_report_entry,
+    refresh_store,
+)
+
+KEEP_ALIVE_TIMEOUT = 15
+MAX_HEADER_COUNT = 100
+MAX_BODY_SIZE = 16 * 1024 * 1024
+MAX_BATCH_QUERIES = 100000
+DEFAULT_SEARCH_LIMIT = 100
+SEARCH_CRITERIA = ["Номер"] + list(SEARCH_CRITERIA_FIELDS) + SCORED_CRITERIA
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def store_mtimes(store):
+    mtimes = []
+    for path in (store.snapshot_path, store.data_path, store.delta_path):
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def load_store(directory):
+    store = RecordStore(directory)
+    store.load()
+    store.build_scored_indexes()
+    return store
+
+
+class LookupServer:
+    def __init__(self, directory="", workers=2, reload_interval=30):
+        self.directory = directory
+        self.workers = workers
+        self.reload_interval = reload_interval
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.batch_slots = None
+        self.store = RecordStore(directory)
+        self.store_mtimes = None
+        self.loaded_at = None
+        self.refreshing = False
+        self.last_refresh_message = ""
+
+    def swap_store(self, store):
+        self.store = store
+        self.store_mtimes = store_mtimes(store)
+        self.loaded_at = time.time()
+
+    async def run_in_pool(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, function, *args
+        )
+
+    async def reload_if_changed(self):
+        if store_mtimes(self.store) == self.store_mtimes or self.refreshing:
+            return
+        self.swap_store(await self.run_in_pool(load_store, self.directory))
+
+    async def watch_store(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await self.reload_if_changed()
+            except Exception:
+                pass
+
+    def refreshed_store(self, full):
+        store = load_store(self.directory)
+        message = refresh_store(store, full)
+        store.build_scored_indexes()
+        return (store, message)
+
+    async def refresh(self, full):
+        try:
+            (store, message) = await self.run_in_pool(self.refreshed_store, full)
+            self.swap_store(store)
+        except Exception as e:
+            message = str(e)
+        finally:
+            self.refreshing = False
+        self.last_refresh_message = message
+
+    async def serve(self, host, port):
+        self.batch_slots = asyncio.Semaphore(self.workers * 2)
+        self.swap_store(await self.run_in_pool(load_store, self.directory))
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        watcher = asyncio.ensure_future(self.watch_store())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self.executor.shutdown(wait=False)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(
+                        reader.readline(), KEEP_ALIVE_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                keep_alive = await self.handle_request(request_line, reader, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request_line, reader, writer):
+        try:
+            (method, target, version) = request_line.decode("latin-1").split()
+        except ValueError:
+            await self.respond(writer, 400, {"error": "Bad request line"}, False)
+            return False
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADER_COUNT:
+                await self.respond(writer, 400, {"error": "Too many headers"}, False)
+                return False
+            (name, _, value) = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            await self.respond(
+                writer, 400, {"error": "Chunked bodies are not supported"}, False
+            )
+            return False
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+        length = headers.get("content-length") or "0"
+        if not (length.isascii() and length.isdigit()):
+            await self.respond(writer, 400, {"error": "Invalid Content-Length"}, False)
+            return False
+        length = int(length)
+        if length > MAX_BODY_SIZE:
+            await self.respond(writer, 413, {"error": "Request body too large"}, False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+        try:
+            (status, payload) = (200, await self.dispatch(method, target, body))
+        except HTTPError as e:
+            (status, payload) = (e.status, {"error": str(e)})
+        except Exception as e:
+            (status, payload) = (500, {"error": str(e)})
+        await self.respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        params = {name: values[-1] for (name, values) in parse_qs(url.query).items()}
+        path = url.path.rstrip("/") or "/"
+        store = self.store
+        if path == "/status":
+            self.require_method(method, "GET")
+            return {
+                "records": len(store),
+                "loaded_at": self.loaded_at,
+                "refreshing": self.refreshing,
+                "last_refresh": self.last_refresh_message,
+            }
+        if path == "/categories":
+            self.require_method(method, "GET")
+            return {"categories": store.categories()}
+        if path == "/search":
+            self.require_method(method, "GET")
+            return self.search(store, params)
+        if path.startswith("/records/"):
+            self.require_method(method, "GET")
+            rows = store.search_index.lookup_id(unquote(path[len("/records/") :]))
+            if not rows:
+                raise HTTPError(404, "Запись не найдена")
+            return {"records": [store.record(row) for row in rows]}
+        if path == "/check":
+            self.require_method(method, "POST")
+            return await self.check(store, body)
+        if path == "/refresh":
+            self.require_method(method, "POST")
+            if self.refreshing:
+                raise HTTPError(409, "Обновление уже выполняется")
+            self.refreshing = True
+            asyncio.ensure_future(self.refresh(params.get("full") in ("1", "true")))
+            return {"refreshing": True}
+        raise HTTPError(404, "Unknown endpoint")
+
+    def require_method(self, method, expected):
+        if method != expected:
+            raise HTTPError(405, f"Use {expected}")
+
+    def criteria_param(self, params, allowed):
+        criteria = params.get("by", "Все поля")
+        if criteria not in allowed:
+            raise HTTPError(400, f"Неизвестный критерий поиска: {criteria}")
+        return criteria
+
+    def int_param(self, params, name, default):
+        try:
+            return max(0, int(params.get(name, default)))
+        except ValueError:
+            raise HTTPError(400, f"Параметр {name} должен быть числом")
+
+    def search(self, store, params):
+        criteria = self.criteria_param(params, SEARCH_CRITERIA)
+        category = params.get("category", "Все категории")
+        offset = self.int_param(params, "offset", 0)
+        limit = self.int_param(params, "limit", DEFAULT_SEARCH_LIMIT)
+        if criteria in SCORED_CRITERIA:
+            matches = store.scored_matches(params.get("q", ""), criteria, category)
+            return {
+                "total": len(matches),
+                "records": [
+                    dict(store.record(row), score=round(score, 3))
+                    for (row, score) in matches[offset : offset + limit]
+                ],
+            }
+        try:
+            rows = store.search(params.get("q", ""), criteria, category)
+        except QuerySyntaxError as e:
+            raise HTTPError(400, str(e))
+        return {
+            "total": len(rows),
+            "records": [store.record(row) for row in rows[offset : offset + limit]],
+        }
+
+    async def check(self, store, body):
+        try:
+            request = json.loads(body or b"{}")
+            queries = request["queries"]
+        except (ValueError, KeyError, TypeError):
+            raise HTTPError(400, 'Ожидается JSON вида {"queries": [...]}')
+        if not isinstance(queries, list) or len(queries) > MAX_BATCH_QUERIES:
+            raise HTTPError(400, "Слишком много запросов или неверный формат")
+        criteria = self.criteria_param(request, list(SEARCH_CRITERIA_FIELDS))
+        if self.batch_slots.locked():
+            raise HTTPError(503, "Сервер занят, повторите запрос позже")
+        async with self.batch_slots:
+            return await self.run_in_pool(
+                self.run_check, store, [str(query) for query in queries], criteria
+            )
+
+    def run_check(self, store, queries, criteria):
+        matcher = BatchMatcher(queries)
+        hits = matcher.run(store, SEARCH_CRITERIA_FIELDS[criteria])
+        results = [
+            batch_report_entry(store, query, rows)
+            for (query, rows) in zip(matcher.queries, hits)
+        ]
+        return {"results": results}
+
+
+def serve(directory="", host="127.0.0.1", port=8080, workers=2, reload_interval=30):
+    server = LookupServer(directory, workers, reload_interval)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
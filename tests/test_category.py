@@ -0,0 +1,229 @@
+import random, re
+import pytest
+from justice4all_core import MATERIAL_CATEGORY_RULES, extract_material_category
+
+SEED = 20240610
+RANDOM_CASES = 20000
+FILLER = [
+    "",
+    " ",
+    ".",
+    "-",
+    "«",
+    "»",
+    ",",
+    "\n",
+    "а",
+    "о",
+    "п",
+    "т",
+    "м",
+    "http",
+    "://",
+]
+LEGACY_CATEGORY_RULES = [
+    (
+        "Книги/Брошюры",
+        [
+            "книга",
+            "книги",
+            "брошюра",
+            "учебник",
+            "печатный материал",
+            "монография",
+            "альманах",
+            "печатный",
+            "e-book",
+            "книжка",
+            "том",
+        ],
+        [],
+    ),
+    ("Журналы", ["журнал", "периодическое издание", "дайджест", "сборник статей"], []),
+    ("Газеты", ["газета", "пресса", "еженедельник", "вестник", "статья из газеты"], []),
+    (
+        "Листовки/Буклеты/Памятки",
+        [
+            "листовка",
+            "буклет",
+            "памятка",
+            "открытка",
+            "флаер",
+            "плакат",
+            "стикер",
+            "наклейка",
+            "баннер",
+            "агитационный материал",
+        ],
+        [],
+    ),
+    (
+        "Аудиозаписи",
+        [
+            "аудиозапись",
+            "песня",
+            "фонограмма",
+            "аудио",
+            "трек",
+            "звуковой файл",
+            "подкаст",
+            "музыкальная композиция",
+            "музыка",
+        ],
+        ["mp3", "wav", "flac", "ogg", "aac", "m4a", "wma"],
+    ),
+    (
+        "Видеозаписи",
+        [
+            "видеозапись",
+            "фильм",
+            "ролик",
+            "видеоматериал",
+            "видео",
+            "видеоклип",
+            "кинофильм",
+            "видеоролик",
+            "мультфильм",
+            "сюжет",
+            "трансляция",
+        ],
+        ["avi", "mp4", "mov", "wmv", "mkv", "flv"],
+    ),
+    (
+        "Изображения/Фото",
+        [
+            "изображение",
+            "фотография",
+            "рисунок",
+            "картинка",
+            "фото",
+            "графический файл",
+            "демонстрационный материал",
+            "коллаж",
+            "мем",
+            "карикатура",
+        ],
+        ["jpg", "jpeg", "png", "gif", "bmp", "webp"],
+    ),
+    (
+        "Веб-материалы",
+        [
+            "сайт",
+            "веб-страница",
+            "интернет-ресурс",
+            "онлайн",
+            "социальная сеть",
+            "telegram",
+            "vkontakte",
+            "мессенджер",
+            "форум",
+            "блог",
+            "канал",
+            "сообщество",
+            "url",
+            "ссылка",
+            "веб-сайт",
+            "интернет-портал",
+            "youtube",
+            "vk",
+            "twitter",
+            "facebook",
+            "instagram",
+        ],
+        [],
+    ),
+    (
+        "Программы/ПО",
+        [
+            "программа",
+            "приложение",
+            "по",
+            "софт",
+            "исполняемый файл",
+            "скрипт",
+            "код",
+            "программное обеспечение",
+            "вирус",
+        ],
+        [
+            "exe",
+            "apk",
+            "dmg",
+            "iso",
+            "zip",
+            "rar",
+            "7z",
+            "dll",
+            "bin",
+            "sh",
+            "bat",
+            "py",
+            "js",
+        ],
+    ),
+    (
+        "Статьи/Тексты",
+        ["статья", "публикация", "текст", "документ", "рукопись", "записка", "письмо"],
+        [],
+    ),
+]
+SAMPLES = [
+    ("Книга «Название» автора", "Книги/Брошюры"),
+    ("Видеоролик «Ролик» на сайте youtube", "Видеозаписи"),
+    ("Аудиозапись песни, файл .mp3, размещенная в социальной сети", "Аудиозаписи"),
+    ("Статья в газете «Вестник»", "Газеты"),
+    ("Текст на странице https://example.org/page", "Веб-материалы"),
+    ("Исполняемый файл setup.exe", "Программы/ПО"),
+    ("Информационный материал", "Прочее"),
+    ("", "Прочее"),
+]
+
+
+def legacy_extract_material_category(description):
+    desc_lower = description.lower()
+    for (category, keywords, extensions) in LEGACY_CATEGORY_RULES:
+        if any(keyword in desc_lower for keyword in keywords) or any(
+            f".{ext}" in desc_lower for ext in extensions
+        ):
+            return category
+        if category == "Веб-материалы" and re.search("(https?|ftp)://", desc_lower):
+            return category
+    return "Прочее"
+
+
+def vocabulary():
+    words = set()
+    for (_, keywords, extensions) in LEGACY_CATEGORY_RULES + MATERIAL_CATEGORY_RULES:
+        words.update(keywords)
+        words.update("." + extension for extension in extensions)
+    return sorted(words)
+
+
+def random_description(rng, words):
+    parts = []
+    for _ in range(rng.randint(0, 6)):
+        word = rng.choice(words)
+        if rng.random() < 0.3:
+            start = rng.randint(0, len(word) - 1)
+            word = word[start : rng.randint(start + 1, len(word))]
+        if rng.random() < 0.2:
+            word = word.upper()
+        parts.append(word)
+        parts.append(rng.choice(FILLER))
+    return "".join(parts)
+
+
+@pytest.mark.parametrize(("description", "category"), SAMPLES)
+def test_sample_descriptions(description, category):
+    assert extract_material_category(description) == category
+    assert legacy_extract_material_category(description) == category
+
+
+def test_matches_legacy_classifier_on_random_keyword_mixes():
+    rng = random.Random(SEED)
+    words = vocabulary()
+    for _ in range(RANDOM_CASES):
+        description = random_description(rng, words)
+        assert extract_material_category(
+            description
+        ) == legacy_extract_material_category(description), description
@@ -0,0 +1,27 @@
+from justice4all_core import ENCODING_SNIFF_SIZE, sniff_encoding
+
+HEADER = "№ п/п;Наименование материала;Дата внесения\n"
+ROW = "{};Книга «Название» автора, изданная в Москве;01.02.2010\n"
+
+
+def csv_prefix(encoding):
+    text = HEADER + "".join(ROW.format(number) for number in range(1, 2000))
+    assert "юст" not in text.lower()
+    return text.encode(encoding)[:ENCODING_SNIFF_SIZE]
+
+
+def test_utf8_prefix_without_marker_word():
+    prefix = csv_prefix("utf-8")
+    assert sniff_encoding(prefix) == "utf-8"
+
+
+def test_utf8_prefix_cut_inside_a_character():
+    prefix = csv_prefix("utf-8")
+    while prefix[-1] & 0xC0 != 0xC0:
+        prefix = prefix[:-1]
+    assert sniff_encoding(prefix) == "utf-8"
+
+
+def test_windows_1251_prefix():
+    prefix = csv_prefix("windows-1251")
+    assert sniff_encoding(prefix) == "windows-1251"
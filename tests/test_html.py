@@ -0,0 +1,25 @@
+import pytest
+from bs4 import BeautifulSoup
+from justice4all_core import strip_html
+
+CASES = [
+    '<a title="a>b">Книга</a> автора',
+    "<b class='x>y'>Текст</b>",
+    "&copy 2020",
+    "&copy2020 Издательство",
+    "AT&T",
+    "&notit; вестник",
+    "&#169 2020",
+    "<p>&laquo;Название&raquo; &amp; &#171;другое&#187;</p>",
+    '<a href="https://example.org/?a=1&amp;b=2">ссылка</a>',
+    "<p>Статья</p><br/>&nbsp;газета",
+]
+
+
+def parser_text(text):
+    return BeautifulSoup(text, "html.parser").get_text(separator=" ", strip=True)
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_matches_html_parser(text):
+    assert strip_html(text) == parser_text(text)
@@ -0,0 +1,24 @@
+import pytest
+from justice4all_core import QuerySyntaxError, query_date_bounds
+
+
+@pytest.mark.parametrize(
+    ("text", "bounds"),
+    [
+        ("29.02.2020", (20200229, 20200229)),
+        ("2020-1-31", (20200131, 20200131)),
+        ("02.2020", (20200200, 20200299)),
+        ("2020-12", (20201200, 20201299)),
+        ("2020", (20200000, 20209999)),
+    ],
+)
+def test_valid_dates(text, bounds):
+    assert query_date_bounds(text) == bounds
+
+
+@pytest.mark.parametrize(
+    "text", ["2020-13-45", "31.02.2020", "29.02.2021", "00.2020", "2020-13", "0000"]
+)
+def test_impossible_dates(text):
+    with pytest.raises(QuerySyntaxError):
+        query_date_bounds(text)